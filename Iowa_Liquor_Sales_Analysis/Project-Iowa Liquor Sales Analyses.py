@@ -11,7 +11,17 @@ def _():
     import plotly.express as px
 
     data_file = '/Users/laurenmitchek/mis501/Iowa_Liquor_Sales-26M.csv.gz'
-    return data_file, mo, pl, px
+
+    # Memory budget: the peak RSS in MB the notebook should stay under (None for
+    # no limit). It picks how the CSV is ingested (liquor/budget.py):
+    #   eager   - load the whole 7.7 GB frame (needed for Task 2.1's size; the
+    #             default with no budget)
+    #   lazy    - stream the CSV through the cleaning steps
+    #   chunked - parse the file a chunk at a time, spilled to temporary Parquet
+    # Set ingest_mode to one of these to choose it directly.
+    max_rss_mb = None
+    ingest_mode = None
+    return data_file, ingest_mode, max_rss_mb, mo, pl, px
 
 
 @app.cell(hide_code=True)
@@ -91,26 +101,13 @@ def _(mo):
 
 @app.cell
 def _(data_file):
-    import hashlib
-
-    def calculate_md5(filepath):
-        """Calculate MD5 hash of a file."""
-        md5_hash = hashlib.md5()
+    from liquor.verify import EXPECTED_MD5, start_md5_check
 
-        # Read file in chunks to handle large files efficiently
-        with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                md5_hash.update(chunk)
-
-        return md5_hash.hexdigest()
-
-    md5_checksum = calculate_md5(data_file)
-
-    if md5_checksum == '796fe6845b8ba6058956363217c4ff17':
-        print("You are using the correct version of the data file.")
-    else:
-        print("STOP! You are NOT using the correct version of the data file.")
-    return
+    # calculate_md5 (liquor/verify.py) hashes the file in one pass through a reused buffer.
+    # It runs in a background thread so it overlaps with ingestion below, and the
+    # digest is cached next to the file by size and mtime, so warm runs skip it.
+    md5_check = start_md5_check(data_file)
+    return EXPECTED_MD5, md5_check
 
 
 @app.cell(hide_code=True)
@@ -125,30 +122,51 @@ def _(mo):
 
 
 @app.cell
-def _(data_file, pl):
-    # Load data using Polars with schema overrides to handle mixed-type columns
-    # Some columns contain non-standard values that require string type
-    orig_df = pl.read_csv(
-        data_file,
-        schema_overrides={
-            "Zip Code": pl.Utf8,  # Contains values like "712-2"
-            "Store Number": pl.Utf8,  # Keep as string initially, will convert later
-            "Vendor Number": pl.Utf8,  # Keep as string initially
-            "Item Number": pl.Utf8,  # Contains values like "x904631"
-        },
-        infer_schema_length=20000  # Increase inference length for better type detection
-    )
+def _(data_file, ingest_mode, max_rss_mb):
+    from liquor.budget import choose_ingest_mode, ingest_sales
+    from liquor.decompress import read_sales_parallel
+    from liquor.store import default_store_dir, is_current, read_profile
+
+    # When the Parquet store below was built from this exact file, its manifest
+    # holds everything the cleaning cells print, so the CSV is not read at all
+    store_dir = default_store_dir(data_file)
+    stored_profile = read_profile(store_dir) if is_current(data_file, store_dir) else None
+
+    chosen_mode = "store" if stored_profile is not None else (ingest_mode or choose_ingest_mode(data_file, max_rss_mb))
+    print(f"Ingest mode: {chosen_mode}")
+
+    if stored_profile is not None:
+        orig_df = None
+        size_bytes = stored_profile['size_bytes']
+        size_mb = size_bytes / (1024 ** 2) if size_bytes is not None else None
+
+        print(f"The Parquet store is current, the CSV is not read: {store_dir}")
+    elif chosen_mode != "eager":
+        # Only a query plan is built here; each analysis below streams the file
+        # (chunked mode first spills it to temporary Parquet a chunk at a time)
+        orig_df = ingest_sales(data_file, chosen_mode, max_rss_mb)
+        size_bytes = None
+        size_mb = None
+
+        print("Lazy scan created, the raw DataFrame is never materialized")
+        print(f"Number of columns: {orig_df.collect_schema().len()}")
+    else:
+        # Load data using Polars with schema overrides to handle mixed-type columns
+        # On more than one core, inflating the gzip overlaps with parsing, or runs
+        # on every core once a block copy has been built with
+        # `python -m liquor.decompress <data file>` (see liquor/decompress.py)
+        orig_df = ingest_sales(data_file, chosen_mode, read_eager=read_sales_parallel)
 
-    # Calculate DataFrame size immediately after loading
-    size_bytes = orig_df.estimated_size()
-    size_mb = size_bytes / (1024 ** 2)
+        # Calculate DataFrame size immediately after loading
+        size_bytes = orig_df.estimated_size()
+        size_mb = size_bytes / (1024 ** 2)
 
-    print(f"DataFrame loaded successfully!")
-    print(f"DataFrame size: {size_bytes:,} bytes")
-    print(f"DataFrame size: {size_mb:.2f} MB")
-    print(f"Number of rows: {orig_df.height:,}")
-    print(f"Number of columns: {orig_df.width}")
-    return orig_df, size_bytes, size_mb
+        print(f"DataFrame loaded successfully!")
+        print(f"DataFrame size: {size_bytes:,} bytes")
+        print(f"DataFrame size: {size_mb:.2f} MB")
+        print(f"Number of rows: {orig_df.height:,}")
+        print(f"Number of columns: {orig_df.width}")
+    return chosen_mode, orig_df, size_bytes, size_mb, store_dir, stored_profile
 
 
 @app.cell(hide_code=True)
@@ -168,8 +186,11 @@ def _(mo):
 
 @app.cell
 def _(size_bytes, size_mb):
-    print(f"DataFrame size: {size_bytes:,} bytes")
-    print(f"DataFrame size: {size_mb:.2f} MB")
+    if size_bytes is None:
+        print('DataFrame size is only measured when ingest_mode = "eager"')
+    else:
+        print(f"DataFrame size: {size_bytes:,} bytes")
+        print(f"DataFrame size: {size_mb:.2f} MB")
     return
 
 
@@ -186,18 +207,22 @@ def _(mo):
 
 
 @app.cell
-def _(orig_df):
-    null_counts = orig_df.null_count()
+def _(orig_df, stored_profile):
+    from liquor.pipeline import profile_sales
+
+    # Null counts, row count and first rows in one scan of the file, or as saved
+    # in the store manifest when the store is current
+    raw_profile = stored_profile if stored_profile is not None else profile_sales(orig_df)
     print("Null value counts:")
-    print(null_counts)
+    print(raw_profile['null_counts'])
 
     # Examine data types and sample data
     print("\nData schema:")
-    print(orig_df.schema)
+    print(raw_profile['head'].schema)
 
     print("\nFirst few rows:")
-    print(orig_df.head())
-    return
+    print(raw_profile['head'])
+    return (raw_profile,)
 
 
 @app.cell(hide_code=True)
@@ -256,58 +281,25 @@ def _(mo):
 
 
 @app.cell
-def _(orig_df, pl):
-    df = (
-        orig_df
-        # Convert date column to proper date type
-        .with_columns(pl.col("Date").str.to_date("%m/%d/%Y").alias("Date"))
-
-        # Optimize integer columns - use strict=False to handle non-numeric values
-        .with_columns([
-            pl.col("Store Number").cast(pl.Int32, strict=False),
-            pl.col("Vendor Number").cast(pl.Int32, strict=False),
-            pl.col("Item Number").cast(pl.Int32, strict=False),
-            pl.col("Bottles Sold").cast(pl.Int32, strict=False),
-        ])
-
-        # Optimize float columns
-        .with_columns([
-            pl.col("Sale (Dollars)").cast(pl.Float32),
-            pl.col("State Bottle Cost").cast(pl.Float32),
-            pl.col("State Bottle Retail").cast(pl.Float32),
-            pl.col("Volume Sold (Liters)").cast(pl.Float32),
-        ])
-
-        # Feature engineering - temporal features
-        .with_columns([
-            pl.col("Date").dt.year().alias("Year"),
-            pl.col("Date").dt.month().alias("Month"),
-            pl.col("Date").dt.quarter().alias("Quarter"),
-            pl.col("Date").dt.weekday().alias("DayOfWeek"),  # 0=Monday, 6=Sunday
-        ])
-
-        # Add weekend flag
-        .with_columns([
-            (pl.col("DayOfWeek") >= 5).alias("IsWeekend")
-        ])
-
-        # Remove rows with null critical values or invalid sales
-        # This also filters out rows with non-numeric Item Numbers that became null
-        .filter(
-            (pl.col("Date").is_not_null()) &
-            (pl.col("Sale (Dollars)").is_not_null()) &
-            (pl.col("Sale (Dollars)") > 0) &
-            (pl.col("Bottles Sold").is_not_null()) &
-            (pl.col("Bottles Sold") > 0) &
-            (pl.col("Item Number").is_not_null())  # Filter out invalid item numbers
-        )
-    )
+def _(orig_df, raw_profile):
+    from liquor.pipeline import clean_sales, row_counts
+
+    # Date parsing, Int32/Float32 casts, temporal features and invalid-row filters
+    # (see the tables above); lazy frames only add these steps to the query plan
+    # With a current store there is nothing to clean, only the saved counts
+    if orig_df is None:
+        df = None
+        cleaned_rows = raw_profile['cleaned_rows']
+    else:
+        df = clean_sales(orig_df)
+        (cleaned_rows,) = row_counts(df)
 
+    original_rows = raw_profile['original_rows']
     print(f"Data Cleaning Summary:")
-    print(f"- Original rows: {orig_df.height:,}")
-    print(f"- Cleaned rows: {df.height:,}")
-    print(f"- Rows removed: {orig_df.height - df.height:,}")
-    return (df,)
+    print(f"- Original rows: {original_rows:,}")
+    print(f"- Cleaned rows: {cleaned_rows:,}")
+    print(f"- Rows removed: {original_rows - cleaned_rows:,}")
+    return cleaned_rows, df
 
 
 @app.cell(hide_code=True)
@@ -374,63 +366,147 @@ def _(mo):
 
 
 @app.cell
-def _(df, pl):
+def _(df):
+    from liquor.categories import categorize_sales
+
     # Apply Major Category classification based on Category Name
-    df_categorized = df.with_columns(
-        pl.when(pl.col("Category Name").str.to_uppercase().str.contains("WHISKEY|WHISKY"))
-        .then(pl.lit("WHISKEY"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("VODKA"))
-        .then(pl.lit("VODKA"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("RUM"))
-        .then(pl.lit("RUM"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("TEQUILA|MEZCAL"))
-        .then(pl.lit("TEQUILA & MEZCAL"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("GIN"))
-        .then(pl.lit("GIN"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("BRANDY|COGNAC"))
-        .then(pl.lit("BRANDY & COGNAC"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("SCHNAPPS"))
-        .then(pl.lit("SCHNAPPS"))
-        .when(
-            pl.col("Category Name").str.to_uppercase().str.contains(
-                "AMARETTO|CORDIALS|LIQUEURS|ANISETTE|CREME DE|TRIPLE SEC"
-            )
-        )
-        .then(pl.lit("LIQUEURS & CORDIALS"))
-        .when(
-            pl.col("Category Name").str.to_uppercase().str.contains(
-                "AMERICAN ALCOHOL|AMERICAN DISTILLED SPIRITS SPECIALTY|DISTILLED SPIRITS SPECIALTY|IMPORTED DISTILLED SPIRITS SPECIALTY|NEUTRAL GRAIN SPIRITS"
-            )
-        )
-        .then(pl.lit("SPECIALTY & OTHER SPIRITS"))
-        .when(
-            pl.col("Category Name").str.to_uppercase().str.contains(
-                "AMERICAN COCKTAILS|COCKTAILS|RTD"
-            )
-        )
-        .then(pl.lit("READY-TO-DRINK"))
-        .when(pl.col("Category Name").str.to_uppercase().str.contains("IOWA DISTILLERIES"))
-        .then(pl.lit("CRAFT/LOCAL"))
-        .when(
-            pl.col("Category Name").str.to_uppercase().str.contains(
-                "DECANTERS|SPECIALTY PACKAGES|DELISTED|SPECIAL ORDER|HIGH PROOF BEER|HOLIDAY VAP|TEMPORARY"
-            )
-        )
-        .then(pl.lit("ADMINISTRATIVE/NON-PRODUCT"))
-        .otherwise(pl.lit("UNCATEGORIZED"))
-        .alias("Major Category")
+    # The rules (liquor/categories.py) run once per distinct Category Name and
+    # the labels are mapped back onto the rows, instead of 13 regex passes per row
+    df_categorized = categorize_sales(df) if df is not None else None
+    return (df_categorized,)
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ### Parquet Store
+    The cleaned and categorized data is converted once to Parquet, partitioned by Year
+    (one folder per year, rows sorted by Date, column statistics on every row group).
+    Later runs skip the CSV entirely: each analysis below reads only the columns it
+    needs, and date filters skip whole years and row groups. The store is rebuilt
+    automatically if the data file changes. When a newer download of the file only adds
+    months, just the new rows are cleaned, categorized and appended, and their totals are
+    added to the saved rollups.
+
+    The repeated text columns (Item Description, City, County, Category Name, Vendor Name,
+    Store Name and Address) are stored dictionary-encoded as Categorical, and Major Category
+    as an Enum of its labels: each distinct string is kept once and rows hold small integer
+    codes, so the frame is smaller and group_bys on these columns hash integers.
+
+    The category summary, analyses and visualizations all read from rollups: revenue,
+    bottles and transaction totals per Major Category, Year/Quarter, Item Description,
+    County, City and weekend flag. They are computed together in one pass over the store
+    and saved with it, so each chart only sorts a small table.
+    """
     )
+    return
+
+
+@app.cell
+def _(
+    cleaned_rows,
+    data_file,
+    df_categorized,
+    raw_profile,
+    size_bytes,
+    store_dir,
+    stored_profile,
+):
+    from liquor.encoding import encode_strings
+    from liquor.store import open_sales_store
+
+    # When the data file is a newer download of the same export, only the rows
+    # dated after the store's last Date are cleaned, categorized and appended;
+    # set append_new_months = False to rebuild the store from scratch instead
+    append_new_months = True
+    converted = []
+    appended = []
+    # A run that read the CSV saves its profile with the store for the next run
+    sales_profile = None if stored_profile is not None else {
+        **raw_profile, 'cleaned_rows': cleaned_rows, 'size_bytes': size_bytes,
+    }
+    sales = open_sales_store(
+        data_file,
+        encode_strings(df_categorized) if df_categorized is not None else None,
+        store_dir,
+        converted=converted,
+        append=append_new_months,
+        appended=appended,
+        profile=sales_profile,
+    )
+    if converted:
+        print(f"Converted the data file to Parquet in: {store_dir}")
+    elif appended:
+        print(f"Appended new rows to the Parquet store in {len(appended)} files: {store_dir}")
+    else:
+        print(f"Reading the Parquet store in: {store_dir}")
+    return (sales,)
+
+
+@app.cell
+def _(sales, store_dir):
+    from liquor.rollups import open_rollups
+
+    # Totals per chart dimension, built in one pass and saved in the store
+    # Newly appended files are aggregated on their own and added to the totals
+    rollup_files = []
+    rollups = open_rollups(store_dir, sales, built=rollup_files)
+    if rollup_files:
+        print(f"Aggregated {len(rollup_files)} store files into the rollups.")
+    else:
+        print("Loaded the saved rollups.")
+    return (rollups,)
 
+
+@app.cell
+def _(EXPECTED_MD5, md5_check):
+    # The MD5 check started before ingestion; by now it has usually finished
+    md5_checksum = md5_check.result()
+
+    if md5_checksum == EXPECTED_MD5:
+        print("You are using the correct version of the data file.")
+    else:
+        print("STOP! You are NOT using the correct version of the data file.")
+    return
+
+
+@app.cell
+def _(pl, rollups):
     # Show categorization summary
     category_summary = (
-        df_categorized.group_by("Major Category")
-        .agg(pl.len().alias("Count"))
+        rollups["category"]
+        .select("Major Category", pl.col("Transactions").alias("Count"))
         .sort("Count", descending=True)
     )
 
     print("Major Category Distribution:")
     print(category_summary)
-    return (df_categorized,)
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ### Dictionary Encoding
+    Estimated size of each text column as plain strings (Utf8) and dictionary-encoded
+    (Categorical), and the time of a revenue group_by on City, County and Item Description
+    in each representation (on the first 500,000 rows when a memory budget is set).
+    """
+    )
+    return
+
+
+@app.cell
+def _(max_rss_mb, sales):
+    from liquor.encoding import encoding_report
+
+    # The report holds a column both ways at once, so under a memory budget it
+    # measures a sample of the rows instead of all of them
+    encoding_summary = encoding_report(sales if max_rss_mb is None else sales.head(500_000))
+    encoding_summary
+    return
 
 
 @app.cell(hide_code=True)
@@ -457,11 +533,9 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl):
+def _(mo, pl, rollups):
     # Task 5.1: Total Revenue and Volume Summary
-    total_revenue = df_categorized.select(pl.col("Sale (Dollars)").sum()).item()
-    total_bottles = df_categorized.select(pl.col("Bottles Sold").sum()).item()
-    total_transactions = df_categorized.height
+    total_revenue, total_bottles, total_transactions = rollups["total"].row(0)
     avg_sale = total_revenue / total_transactions
     avg_bottles = total_bottles / total_transactions
 
@@ -491,18 +565,10 @@ def _(df_categorized, mo, pl):
 
 
 @app.cell
-def _(df_categorized, mo, pl):
+def _(mo, pl, rollups, top_rows):
     # Task 5.2: Top 10 Product Categories by Revenue
     top_categories = (
-        df_categorized
-        .group_by("Major Category")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.col("Bottles Sold").sum().alias("Total Bottles"),
-            pl.len().alias("Transactions")
-        ])
-        .sort("Total Revenue", descending=True)
-        .head(10)
+        top_rows(rollups["category"], 10, "Total Revenue")
         .with_columns([
             (pl.col("Total Revenue") / pl.col("Total Revenue").sum() * 100).alias("% of Total Revenue")
         ])
@@ -517,14 +583,11 @@ def _(df_categorized, mo, pl):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, pl, px, rollups):
     # Task 5.3: Quarterly Sales Trends
     quarterly_sales = (
-        df_categorized
-        .group_by(["Year", "Quarter"])
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue")
-        ])
+        rollups["quarter"]
+        .select("Year", "Quarter", "Total Revenue")
         .sort(["Year", "Quarter"])
         .with_columns([
             (pl.col("Year").cast(pl.Utf8) + " Q" + pl.col("Quarter").cast(pl.Utf8)).alias("Period")
@@ -567,6 +630,16 @@ def _(mo):
     return
 
 
+@app.cell
+def _(rollups):
+    from liquor.rankings import top_rows, top_rows_by
+
+    # Rankings take the top rows without sorting every group
+    # Visualizations 1 and 2 share one aggregation of the products
+    top_products = top_rows_by(rollups["item"], 20, ["Total Revenue", "Total Bottles"])
+    return top_products, top_rows
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""### Visualization 1: Top 20 Products by Revenue""")
@@ -574,17 +647,10 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, px, top_products):
     # Top 20 Products by Revenue
-    top_products_revenue = (
-        df_categorized
-        .group_by("Item Description")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.col("Bottles Sold").sum().alias("Total Bottles")
-        ])
-        .sort("Total Revenue", descending=True)
-        .head(20)
+    top_products_revenue = top_products["Total Revenue"].select(
+        "Item Description", "Total Revenue", "Total Bottles"
     )
 
     fig1 = px.bar(
@@ -615,17 +681,10 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, px, top_products):
     # Top 20 Products by Volume
-    top_products_volume = (
-        df_categorized
-        .group_by("Item Description")
-        .agg([
-            pl.col("Bottles Sold").sum().alias("Total Bottles"),
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue")
-        ])
-        .sort("Total Bottles", descending=True)
-        .head(20)
+    top_products_volume = top_products["Total Bottles"].select(
+        "Item Description", "Total Bottles", "Total Revenue"
     )
 
     fig2 = px.bar(
@@ -656,17 +715,10 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, px, rollups, top_rows):
     # Top 15 Counties by Revenue
-    top_counties = (
-        df_categorized
-        .group_by("County")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.len().alias("Transactions")
-        ])
-        .sort("Total Revenue", descending=True)
-        .head(15)
+    top_counties = top_rows(
+        rollups["county"].select("County", "Total Revenue", "Transactions"), 15, "Total Revenue"
     )
 
     fig3 = px.bar(
@@ -697,17 +749,10 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, px, rollups, top_rows):
     # Top 20 Cities by Sales
-    top_cities = (
-        df_categorized
-        .group_by("City")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.col("Bottles Sold").sum().alias("Total Bottles")
-        ])
-        .sort("Total Revenue", descending=True)
-        .head(20)
+    top_cities = top_rows(
+        rollups["city"].select("City", "Total Revenue", "Total Bottles"), 20, "Total Revenue"
     )
 
     fig4 = px.bar(
@@ -738,16 +783,10 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, pl, px, rollups):
     # Weekday vs Weekend Sales (Standardized for number of days)
     weekday_weekend = (
-        df_categorized
-        .group_by("IsWeekend")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.col("Bottles Sold").sum().alias("Total Bottles"),
-            pl.len().alias("Transactions")
-        ])
+        rollups["weekend"]
         .with_columns([
             pl.when(pl.col("IsWeekend"))
             .then(pl.lit("Weekend"))
@@ -795,22 +834,18 @@ def _(mo):
 
 
 @app.cell
-def _(df_categorized, mo, pl, px):
+def _(mo, pl, px, rollups, top_rows):
     # Top 20 Cities by Sales Efficiency (Average Sale per Transaction)
     # Filter cities with at least 1000 transactions to ensure statistical significance
-    cities_efficiency = (
-        df_categorized
-        .group_by("City")
-        .agg([
-            pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
-            pl.len().alias("Transactions")
-        ])
+    cities_efficiency = top_rows(
+        rollups["city"]
+        .select("City", "Total Revenue", "Transactions")
         .filter(pl.col("Transactions") >= 1000)
         .with_columns([
             (pl.col("Total Revenue") / pl.col("Transactions")).alias("Avg Sale per Transaction")
-        ])
-        .sort("Avg Sale per Transaction", descending=True)
-        .head(20)
+        ]),
+        20,
+        "Avg Sale per Transaction",
     )
 
     fig6 = px.bar(
@@ -834,5 +869,24 @@ def _(df_categorized, mo, pl, px):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""### Peak Memory""")
+    return
+
+
+@app.cell
+def _(chosen_mode, max_rss_mb):
+    from liquor.budget import peak_rss_mb
+
+    # Highest resident memory of the notebook process so far, against the budget
+    peak_mb = peak_rss_mb()
+    print(f"Ingest mode: {chosen_mode}")
+    print(f"Peak memory: {peak_mb:,.0f} MB")
+    if max_rss_mb is not None:
+        print(f"Budget: {max_rss_mb:,} MB ({'within' if peak_mb <= max_rss_mb else 'over'} budget)")
+    return
+
+
 if __name__ == "__main__":
     app.run()
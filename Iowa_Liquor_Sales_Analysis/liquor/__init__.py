@@ -0,0 +1 @@
+"""Helpers for loading and analyzing the Iowa liquor sales data."""
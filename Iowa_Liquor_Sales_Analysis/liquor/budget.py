@@ -0,0 +1,120 @@
+import atexit
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import zlib
+
+import polars as pl
+
+from liquor.decompress import CHUNK_SIZE, GZIP_WBITS, READ_SIZE, _parse_chunk, iter_csv_chunks
+from liquor.pipeline import read_sales, scan_sales
+
+# Choose how the CSV is ingested from a memory budget (max RSS):
+#   eager   - the whole file as one DataFrame, which takes several times the
+#             size of the uncompressed CSV while it is read and cleaned
+#   lazy    - a streaming scan_csv; Polars releases before the new streaming
+#             engine inflate a .gz into memory first, so budget for the CSV size
+#   chunked - the file is inflated and parsed one chunk at a time, and every
+#             chunk is spilled to a temporary Parquet file that is then scanned
+#             lazily, so memory is bounded by the chunk size
+# Later steps (cleaning, the store conversion, the rollups) stream from
+# whichever frame is returned.
+
+INGEST_MODES = ["eager", "lazy", "chunked"]
+
+MB = 1024 * 1024
+
+# Peak RSS per MB of uncompressed CSV, measured on a 2M-row sample
+EAGER_MB_PER_CSV_MB = 3.5
+LAZY_MB_PER_CSV_MB = 1.0
+
+# Peak RSS per MB of chunk in chunked mode (the text, the parsed chunk and the
+# Parquet writer's buffers)
+CHUNKED_MB_PER_CHUNK_MB = 12
+
+# The interpreter, Polars, marimo and plotly before any data is loaded
+BASE_MB = 200
+
+MIN_CHUNK_SIZE = 8 * MB
+
+
+def peak_rss_mb():
+    # Peak resident set size of this process so far
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+def estimate_csv_mb(data_file, sample_size=READ_SIZE):
+    # Uncompressed size of the CSV; for a .gz it is extrapolated from the
+    # compression ratio of the first sample_size bytes
+    size = os.path.getsize(data_file)
+    if not data_file.endswith('.gz'):
+        return size / MB
+    with open(data_file, 'rb') as f:
+        sample = f.read(sample_size)
+    inflated = zlib.decompressobj(GZIP_WBITS).decompress(sample)
+    return size * len(inflated) / len(sample) / MB
+
+
+def choose_ingest_mode(data_file, max_rss_mb=None):
+    # The fastest mode expected to fit in max_rss_mb
+    # With no budget the file is read eagerly, so Task 2.1 can measure the
+    # DataFrame's size; lazy and chunked are only picked for a budget too small
+    # for eager
+    if max_rss_mb is None:
+        return "eager"
+    csv_mb = estimate_csv_mb(data_file)
+    if BASE_MB + csv_mb * EAGER_MB_PER_CSV_MB <= max_rss_mb:
+        return "eager"
+    if BASE_MB + csv_mb * LAZY_MB_PER_CSV_MB <= max_rss_mb:
+        return "lazy"
+    return "chunked"
+
+
+def chunk_size_for(max_rss_mb=None):
+    # Largest chunk expected to fit in the budget (CHUNK_SIZE at most)
+    if max_rss_mb is None:
+        return CHUNK_SIZE
+    fits = int((max_rss_mb - BASE_MB) / CHUNKED_MB_PER_CHUNK_MB * MB)
+    return max(MIN_CHUNK_SIZE, min(CHUNK_SIZE, fits))
+
+
+def spill_sales(data_file, spill_dir=None, chunk_size=CHUNK_SIZE):
+    # Parse the CSV a chunk at a time into Parquet files in spill_dir and scan
+    # them lazily. Without a spill_dir a temporary one is used and removed when
+    # the process exits.
+    if spill_dir is None:
+        spill_dir = tempfile.mkdtemp(prefix='iowa_spill_')
+        atexit.register(shutil.rmtree, spill_dir, ignore_errors=True)
+    os.makedirs(spill_dir, exist_ok=True)
+
+    # Small compressed reads, so one read never inflates to much more than a chunk
+    chunks = iter_csv_chunks(data_file, chunk_size, read_size=min(READ_SIZE, chunk_size // 8))
+    header = next(chunks)
+    paths = []
+    schema = None
+    for number, chunk in enumerate(chunks):
+        # The first chunk infers the schema, like read_csv on the whole file
+        frame = _parse_chunk(header, chunk, schema)
+        schema = frame.schema
+        path = os.path.join(spill_dir, f'chunk-{number:05d}.parquet')
+        frame.write_parquet(path)
+        paths.append(path)
+        del chunk, frame
+    if not paths:
+        return _parse_chunk(header, b'').lazy()
+    return pl.scan_parquet(paths)
+
+
+def ingest_sales(data_file, mode, max_rss_mb=None, read_eager=read_sales):
+    # Load data_file the way mode says: a DataFrame for eager, otherwise a LazyFrame
+    if mode == "eager":
+        return read_eager(data_file)
+    if mode == "lazy":
+        return scan_sales(data_file)
+    if mode == "chunked":
+        return spill_sales(data_file, chunk_size=chunk_size_for(max_rss_mb))
+    raise ValueError(f"Unknown ingest mode {mode!r}; expected one of {INGEST_MODES}")
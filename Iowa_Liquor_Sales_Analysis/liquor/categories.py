@@ -0,0 +1,72 @@
+import polars as pl
+
+# Industry-standard Major Category labels, checked in order against the
+# upper-cased Category Name. The first matching pattern wins.
+MAJOR_CATEGORY_RULES = [
+    ("WHISKEY", "WHISKEY|WHISKY"),
+    ("VODKA", "VODKA"),
+    ("RUM", "RUM"),
+    ("TEQUILA & MEZCAL", "TEQUILA|MEZCAL"),
+    ("GIN", "GIN"),
+    ("BRANDY & COGNAC", "BRANDY|COGNAC"),
+    ("SCHNAPPS", "SCHNAPPS"),
+    ("LIQUEURS & CORDIALS", "AMARETTO|CORDIALS|LIQUEURS|ANISETTE|CREME DE|TRIPLE SEC"),
+    (
+        "SPECIALTY & OTHER SPIRITS",
+        "AMERICAN ALCOHOL|AMERICAN DISTILLED SPIRITS SPECIALTY|DISTILLED SPIRITS SPECIALTY|IMPORTED DISTILLED SPIRITS SPECIALTY|NEUTRAL GRAIN SPIRITS",
+    ),
+    ("READY-TO-DRINK", "AMERICAN COCKTAILS|COCKTAILS|RTD"),
+    ("CRAFT/LOCAL", "IOWA DISTILLERIES"),
+    (
+        "ADMINISTRATIVE/NON-PRODUCT",
+        "DECANTERS|SPECIALTY PACKAGES|DELISTED|SPECIAL ORDER|HIGH PROOF BEER|HOLIDAY VAP|TEMPORARY",
+    ),
+]
+
+UNCATEGORIZED = "UNCATEGORIZED"
+
+# Every label a row can get, in rule order
+MAJOR_CATEGORIES = [label for label, _ in MAJOR_CATEGORY_RULES] + [UNCATEGORIZED]
+
+
+def major_category_expr(column="Category Name"):
+    # One when/then branch per rule, falling through to UNCATEGORIZED
+    category_name = pl.col(column).str.to_uppercase()
+    label, pattern = MAJOR_CATEGORY_RULES[0]
+    expr = pl.when(category_name.str.contains(pattern)).then(pl.lit(label))
+    for label, pattern in MAJOR_CATEGORY_RULES[1:]:
+        expr = expr.when(category_name.str.contains(pattern)).then(pl.lit(label))
+    return expr.otherwise(pl.lit(UNCATEGORIZED)).alias("Major Category")
+
+
+def major_category_mapping(names):
+    # Run the rules once over a Series of distinct Category Names
+    # Returns a frame of Category Name -> Major Category
+    return pl.DataFrame({"Category Name": names}).with_columns(major_category_expr())
+
+
+def _categorize_batch(names):
+    # Classify only the distinct names in the batch (a few hundred, against
+    # millions of rows) and map every row to its label
+    mapping = major_category_mapping(names.unique().drop_nulls())
+    return (
+        names.replace_strict(
+            mapping["Category Name"],
+            mapping["Major Category"],
+            default=UNCATEGORIZED,
+            return_dtype=pl.Utf8,
+        )
+        .fill_null(UNCATEGORIZED)
+        .alias("Major Category")
+    )
+
+
+def categorize_sales(frame):
+    # Add the Major Category column to an eager or lazy frame
+    # The rules run per distinct Category Name rather than per row; the lookup
+    # is elementwise, so lazy frames still stream batch by batch
+    return frame.with_columns(
+        pl.col("Category Name")
+        .map_batches(_categorize_batch, return_dtype=pl.Utf8, is_elementwise=True)
+        .alias("Major Category")
+    )
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from liquor.pipeline import INFER_SCHEMA_LENGTH, SCHEMA_OVERRIDES, read_sales
+
+# Faster ways to get the gzip CSV into Polars than one single-threaded inflate
+# followed by the parse:
+#   read_sales_pipelined - a producer thread inflates the file in large chunks
+#       while the main thread parses the previous chunk (zlib and Polars both
+#       release the GIL, so the two overlap)
+#   recompress_blocks / read_sales_blocks - a one-time rewrite of the file as
+#       independent gzip members (still a normal .csv.gz), each holding whole
+#       rows, so the members can be inflated and parsed on all cores at once
+#
+# Build the block copy once from the command line; it is skipped while the copy
+# is current for the data file:
+#
+#   python -m liquor.decompress /path/to/Iowa_Liquor_Sales-26M.csv.gz
+#   python -m liquor.decompress /path/to/Iowa_Liquor_Sales-26M.csv.gz --force
+
+CHUNK_SIZE = 64 * 1024 * 1024
+READ_SIZE = 8 * 1024 * 1024
+
+# Gzip header and trailer, which zlib checks for us
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _record_boundary(buffer):
+    # Position just past the last newline that ends a whole CSV record, i.e.
+    # one that isn't inside a quoted field (an even number of quotes before it)
+    end = buffer.rfind(b'\n')
+    while end != -1 and buffer.count(b'"', 0, end) % 2:
+        end = buffer.rfind(b'\n', 0, end)
+    return end + 1
+
+
+def iter_decompressed(data_file, read_size=READ_SIZE):
+    # Inflate a gzip file (one or several members) in pieces
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    with open(data_file, 'rb') as f:
+        while True:
+            data = f.read(read_size)
+            if not data:
+                break
+            while data:
+                yield decompressor.decompress(data)
+                # A new gzip member starts after the end of the previous one
+                data = decompressor.unused_data if decompressor.eof else b''
+                if decompressor.eof:
+                    decompressor = zlib.decompressobj(GZIP_WBITS)
+    yield decompressor.flush()
+
+
+def iter_csv_chunks(data_file, chunk_size=CHUNK_SIZE, read_size=READ_SIZE):
+    # Yield the CSV header, then chunks of roughly chunk_size bytes that each
+    # hold whole records
+    pending = b''
+    header = None
+    for data in iter_decompressed(data_file, read_size):
+        pending += data
+        if header is None:
+            newline = pending.find(b'\n')
+            if newline == -1:
+                continue
+            header, pending = pending[:newline + 1], pending[newline + 1:]
+            yield header
+        if len(pending) >= chunk_size:
+            boundary = _record_boundary(pending)
+            if boundary:
+                yield pending[:boundary]
+                pending = pending[boundary:]
+    if pending:
+        yield pending
+
+
+def _produce(chunks, buffer):
+    # Runs in the producer thread: push every chunk, then a sentinel
+    try:
+        for chunk in chunks:
+            buffer.put(chunk)
+        buffer.put(None)
+    except BaseException as error:
+        buffer.put(error)
+
+
+def iter_csv_chunks_threaded(data_file, chunk_size=CHUNK_SIZE, prefetch=2):
+    # Same chunks as iter_csv_chunks, inflated ahead in a background thread
+    # At most prefetch chunks wait in memory for the consumer
+    buffer = queue.Queue(maxsize=prefetch)
+    producer = threading.Thread(
+        target=_produce,
+        args=(iter_csv_chunks(data_file, chunk_size), buffer),
+        daemon=True,
+    )
+    producer.start()
+    while True:
+        chunk = buffer.get()
+        if chunk is None:
+            break
+        if isinstance(chunk, BaseException):
+            raise chunk
+        yield chunk
+    producer.join()
+
+
+def _parse_chunk(header, chunk, schema=None):
+    if schema is None:
+        return pl.read_csv(header + chunk, schema_overrides=SCHEMA_OVERRIDES, infer_schema_length=INFER_SCHEMA_LENGTH)
+    return pl.read_csv(header + chunk, schema=schema)
+
+
+def _parse_chunks(header, chunks, transform=None):
+    # Parse chunks with the schema inferred from the first one, the same way
+    # pl.read_csv infers it from the first rows of the file
+    frames = []
+    schema = None
+    for chunk in chunks:
+        frame = _parse_chunk(header, chunk, schema)
+        schema = frame.schema
+        frames.append(transform(frame) if transform is not None else frame)
+    return frames, schema
+
+
+def read_sales_pipelined(data_file, chunk_size=CHUNK_SIZE, transform=None):
+    # Read the whole CSV while inflating the next chunk in a background thread
+    # transform (e.g. cleaning) is applied to each parsed chunk, so the raw
+    # rows of only one chunk are alive at a time
+    chunks = iter_csv_chunks_threaded(data_file, chunk_size)
+    header = next(chunks)
+    frames, schema = _parse_chunks(header, chunks, transform)
+    return pl.concat(frames) if frames else pl.DataFrame(schema=schema)
+
+
+def default_block_file(data_file):
+    # Iowa_Liquor_Sales-26M.csv.gz -> Iowa_Liquor_Sales-26M.blocks.csv.gz
+    base = data_file[:-len('.csv.gz')] if data_file.endswith('.csv.gz') else data_file
+    return f'{base}.blocks.csv.gz'
+
+
+def _index_path(block_file):
+    return f'{block_file}.index.json'
+
+
+def recompress_blocks(data_file, block_file=None, chunk_size=CHUNK_SIZE, level=6):
+    # Rewrite data_file as independent gzip members of whole rows, and record
+    # each member's offset in an index next to it. Any gzip tool still reads the
+    # result as one file.
+    block_file = block_file or default_block_file(data_file)
+    chunks = iter_csv_chunks_threaded(data_file, chunk_size)
+    header = next(chunks)
+
+    blocks = []
+    tmp_path = f'{block_file}.tmp'
+    with open(tmp_path, 'wb') as f:
+        # The header gets its own member, so every data member is just rows
+        f.write(_compress_member(header, level))
+        for chunk in chunks:
+            offset = f.tell()
+            f.write(_compress_member(chunk, level))
+            blocks.append([offset, f.tell() - offset])
+    os.replace(tmp_path, block_file)
+
+    stat = os.stat(data_file)
+    index = {
+        'source': os.path.basename(data_file),
+        'source_fingerprint': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+        'header': header.decode('utf-8'),
+        'blocks': blocks,
+    }
+    with open(_index_path(block_file), 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+def _compress_member(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def read_block_index(block_file):
+    try:
+        with open(_index_path(block_file), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def blocks_are_current(data_file, block_file=None):
+    # True when block_file was recompressed from this version of data_file
+    index = read_block_index(block_file or default_block_file(data_file))
+    stat = os.stat(data_file)
+    return index is not None and index['source_fingerprint'] == {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def read_sales_blocks(block_file, workers=None, transform=None):
+    # Inflate and parse every member of a recompressed file in parallel
+    # The first member fixes the schema; the rest are parsed with it
+    index = read_block_index(block_file)
+    header = index['header'].encode('utf-8')
+    workers = workers or os.cpu_count()
+
+    def inflate(block):
+        offset, length = block
+        with open(block_file, 'rb') as f:
+            f.seek(offset)
+            return zlib.decompress(f.read(length), GZIP_WBITS)
+
+    def load(block, schema):
+        frame = _parse_chunk(header, inflate(block), schema)
+        return transform(frame) if transform is not None else frame
+
+    if not index['blocks']:
+        return pl.DataFrame()
+    first = _parse_chunk(header, inflate(index['blocks'][0]))
+    schema = first.schema
+    frames = [transform(first) if transform is not None else first]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames.extend(executor.map(lambda block: load(block, schema), index['blocks'][1:]))
+    return pl.concat(frames)
+
+
+def read_sales_parallel(data_file, workers=None, transform=None):
+    # Use the recompressed block copy of data_file when there is a current one,
+    # otherwise overlap inflating and parsing in the pipelined reader. Both need
+    # more than one core to pay off, so a single-core machine just uses read_csv.
+    if (workers or os.cpu_count() or 1) > 1:
+        block_file = default_block_file(data_file)
+        if os.path.exists(block_file) and blocks_are_current(data_file, block_file):
+            return read_sales_blocks(block_file, workers, transform)
+        return read_sales_pipelined(data_file, transform=transform)
+    frame = read_sales(data_file)
+    return transform(frame) if transform is not None else frame
+
+
+def build_blocks(data_file, block_file=None, force=False):
+    # Recompress data_file into its block copy unless a current one exists
+    # Returns True when the copy was (re)built
+    block_file = block_file or default_block_file(data_file)
+    if not force and os.path.exists(block_file) and blocks_are_current(data_file, block_file):
+        return False
+    recompress_blocks(data_file, block_file)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompress the Iowa gzip CSV into independent blocks for parallel reads")
+    parser.add_argument('data_file')
+    parser.add_argument('--block-file', help='where to write the copy (default: <name>.blocks.csv.gz next to the data file)')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the copy is current')
+    args = parser.parse_args(argv)
+
+    block_file = args.block_file or default_block_file(args.data_file)
+    if build_blocks(args.data_file, block_file, args.force):
+        print(f"Block copy written to: {block_file} ({len(read_block_index(block_file)['blocks'])} blocks)")
+    else:
+        print(f"Block copy is current: {block_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import time
+
+import polars as pl
+
+from liquor.categories import MAJOR_CATEGORIES
+from liquor.pipeline import collect
+
+# Dictionary encoding for the repeated text columns. Each distinct value is
+# stored once and every row holds a small integer code, which shrinks the
+# frame and turns group_bys on these columns into integer hashing.
+
+STRING_COLUMNS = [
+    "Item Description",
+    "City",
+    "County",
+    "Category Name",
+    "Vendor Name",
+    "Store Name",
+    "Address",
+]
+
+GROUP_BY_COLUMNS = ["City", "County", "Item Description"]
+
+MB = 1024 ** 2
+
+
+def enable_string_cache():
+    # Older Polars releases need a global string cache so categoricals built in
+    # different chunks or Parquet files share codes and can be combined; newer
+    # releases (with pl.Categories) always share them
+    if not hasattr(pl, "Categories"):
+        pl.enable_string_cache()
+
+
+def encode_strings(frame, columns=STRING_COLUMNS):
+    # Cast the text columns to Categorical and Major Category to an Enum of its
+    # known labels, on an eager or lazy frame
+    enable_string_cache()
+    encoded = [pl.col(column).cast(pl.Categorical) for column in columns]
+    if "Major Category" in frame.collect_schema().names():
+        encoded.append(pl.col("Major Category").cast(pl.Enum(MAJOR_CATEGORIES)))
+    return frame.with_columns(encoded)
+
+
+def _time_group_by(frame, column, repeat=3):
+    # Best of a few runs of the per-group revenue sum the visualizations use
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame.group_by(column).agg(pl.col("Sale (Dollars)").sum())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def encoding_report(frame, columns=STRING_COLUMNS, group_by_columns=GROUP_BY_COLUMNS):
+    # Compare each column as plain strings and dictionary-encoded: estimated
+    # size, and the time of a group_by on it. Columns are loaded one at a time,
+    # so only one column is ever held twice.
+    rows = []
+    for column in columns:
+        encoded = collect(frame.select(pl.col(column).cast(pl.Categorical), pl.col("Sale (Dollars)")))
+        plain = encoded.with_columns(pl.col(column).cast(pl.Utf8))
+        row = {
+            "Column": column,
+            "Distinct Values": encoded[column].n_unique(),
+            "Utf8 MB": plain[column].estimated_size() / MB,
+            "Categorical MB": encoded[column].estimated_size() / MB,
+            "group_by Utf8 (s)": None,
+            "group_by Categorical (s)": None,
+        }
+        if column in group_by_columns:
+            row["group_by Utf8 (s)"] = _time_group_by(plain, column)
+            row["group_by Categorical (s)"] = _time_group_by(encoded, column)
+        rows.append(row)
+
+    return pl.DataFrame(rows).with_columns(
+        (100 - pl.col("Categorical MB") / pl.col("Utf8 MB") * 100).alias("% Saved"),
+        (pl.col("group_by Utf8 (s)") / pl.col("group_by Categorical (s)")).alias("group_by Speedup"),
+    )
@@ -0,0 +1,105 @@
+import polars as pl
+
+# Ingestion and cleaning for the Iowa liquor sales CSV. Every step accepts
+# either an eager DataFrame or a LazyFrame, so the notebook can run the same
+# cleaning on a fully loaded frame or as part of a streaming query.
+
+# Some columns contain non-standard values that require string type
+SCHEMA_OVERRIDES = {
+    "Zip Code": pl.Utf8,  # Contains values like "712-2"
+    "Store Number": pl.Utf8,  # Keep as string initially, will convert later
+    "Vendor Number": pl.Utf8,  # Keep as string initially
+    "Item Number": pl.Utf8,  # Contains values like "x904631"
+}
+
+# Increase inference length for better type detection
+INFER_SCHEMA_LENGTH = 20000
+
+
+def read_sales(data_file):
+    # Eagerly load the whole CSV into memory
+    return pl.read_csv(data_file, schema_overrides=SCHEMA_OVERRIDES, infer_schema_length=INFER_SCHEMA_LENGTH)
+
+
+def scan_sales(data_file):
+    # Lazily scan the CSV; nothing is read until a query is collected
+    return pl.scan_csv(data_file, schema_overrides=SCHEMA_OVERRIDES, infer_schema_length=INFER_SCHEMA_LENGTH)
+
+
+def clean_sales(frame):
+    # Type conversions, temporal features and removal of invalid rows
+    return (
+        frame
+        # Convert date column to proper date type
+        .with_columns(pl.col("Date").str.to_date("%m/%d/%Y").alias("Date"))
+
+        # Optimize integer columns - use strict=False to handle non-numeric values
+        .with_columns([
+            pl.col("Store Number").cast(pl.Int32, strict=False),
+            pl.col("Vendor Number").cast(pl.Int32, strict=False),
+            pl.col("Item Number").cast(pl.Int32, strict=False),
+            pl.col("Bottles Sold").cast(pl.Int32, strict=False),
+        ])
+
+        # Optimize float columns
+        .with_columns([
+            pl.col("Sale (Dollars)").cast(pl.Float32),
+            pl.col("State Bottle Cost").cast(pl.Float32),
+            pl.col("State Bottle Retail").cast(pl.Float32),
+            pl.col("Volume Sold (Liters)").cast(pl.Float32),
+        ])
+
+        # Feature engineering - temporal features
+        .with_columns([
+            pl.col("Date").dt.year().alias("Year"),
+            pl.col("Date").dt.month().alias("Month"),
+            pl.col("Date").dt.quarter().alias("Quarter"),
+            pl.col("Date").dt.weekday().alias("DayOfWeek"),  # 0=Monday, 6=Sunday
+        ])
+
+        # Add weekend flag
+        .with_columns([
+            (pl.col("DayOfWeek") >= 5).alias("IsWeekend")
+        ])
+
+        # Remove rows with null critical values or invalid sales
+        # This also filters out rows with non-numeric Item Numbers that became null
+        .filter(
+            (pl.col("Date").is_not_null()) &
+            (pl.col("Sale (Dollars)").is_not_null()) &
+            (pl.col("Sale (Dollars)") > 0) &
+            (pl.col("Bottles Sold").is_not_null()) &
+            (pl.col("Bottles Sold") > 0) &
+            (pl.col("Item Number").is_not_null())  # Filter out invalid item numbers
+        )
+    )
+
+
+def collect(frame):
+    # Run a lazy query on the streaming engine, which processes the file in
+    # batches so memory is bounded by the query's working set rather than the
+    # raw data. Eager frames pass straight through.
+    if isinstance(frame, pl.LazyFrame):
+        return frame.collect(engine="streaming")
+    return frame
+
+
+def profile_sales(frame, rows=5):
+    # Null counts per column, the first rows and the row count of the raw sales;
+    # a lazy frame is profiled in one collect_all so the three share a scan
+    null_counts, head, count = pl.collect_all(
+        [frame.lazy().null_count(), frame.lazy().head(rows), frame.lazy().select(pl.len())],
+        engine="streaming",
+    )
+    return {'original_rows': count.item(), 'null_counts': null_counts, 'head': head}
+
+
+def row_counts(*frames):
+    # Row counts of several frames; lazy frames are counted in one collect_all
+    # so they can share a scan of the source file
+    lazy = [frame.select(pl.len()) for frame in frames if isinstance(frame, pl.LazyFrame)]
+    counted = iter(pl.collect_all(lazy, engine="streaming")) if lazy else iter([])
+    return [
+        next(counted).item() if isinstance(frame, pl.LazyFrame) else frame.height
+        for frame in frames
+    ]
@@ -0,0 +1,20 @@
+import polars as pl
+
+from liquor.pipeline import collect
+
+# Top-N rankings for the charts. top_k selects the N largest rows without
+# sorting the whole table (tens of thousands of Item Descriptions to keep 20),
+# and only those N rows are sorted for display.
+
+
+def top_rows(table, k, by):
+    # The k rows with the largest values of by, largest first
+    return table.top_k(k, by=by).sort(by, descending=True)
+
+
+def top_rows_by(table, k, metrics):
+    # Top k rows by each of several metrics of the same table, as a dict of
+    # metric -> rows. A lazy table (e.g. a group_by) is collected only once and
+    # every ranking is taken from that single aggregation.
+    table = collect(table) if isinstance(table, pl.LazyFrame) else table
+    return {metric: top_rows(table, k, metric) for metric in metrics}
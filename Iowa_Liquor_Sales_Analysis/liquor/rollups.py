@@ -0,0 +1,126 @@
+import os
+import shutil
+
+import polars as pl
+
+from liquor.store import read_manifest, scan_store, write_manifest
+
+# Pre-aggregated totals behind the category summary, analyses and
+# visualizations. Every chart groups the sales by one dimension and sums the
+# same measures, so all of those group_bys are collected together in one
+# collect_all, sharing the scan of the store, and the small results are saved in
+# the store next to the data. The charts then sort and filter tables of at most
+# a few thousand rows instead of scanning every sale.
+#
+# A single cube keyed by (Date, Store, Item, Category) would have close to one
+# row per sale, so each dimension gets its own rollup instead. Months appended to
+# the store are aggregated on their own and added to the saved totals.
+
+# Bump whenever the rollups or their measures change so saved ones get rebuilt
+ROLLUP_VERSION = 2
+
+# Rollup name -> group_by keys; "total" has no keys and is a single row
+ROLLUPS = {
+    "total": [],
+    "category": ["Major Category"],
+    "quarter": ["Year", "Quarter"],
+    "item": ["Item Description"],
+    "county": ["County"],
+    "city": ["City"],
+    "weekend": ["IsWeekend"],
+}
+
+MEASURES = [
+    pl.col("Sale (Dollars)").sum().alias("Total Revenue"),
+    pl.col("Bottles Sold").sum().alias("Total Bottles"),
+    pl.len().alias("Transactions"),
+]
+
+
+def rollup_query(frame, keys):
+    # Lazy query for one rollup of an eager or lazy frame of sales
+    if not keys:
+        return frame.lazy().select(MEASURES)
+    return frame.lazy().group_by(keys).agg(MEASURES)
+
+
+def build_rollups(frame, rollups=ROLLUPS):
+    # Compute every rollup in one collect_all
+    names = list(rollups)
+    tables = pl.collect_all([rollup_query(frame, rollups[name]) for name in names], engine="streaming")
+    return dict(zip(names, tables))
+
+
+def _rollup_dir(store_dir):
+    return os.path.join(store_dir, '_rollups')
+
+
+def merge_rollups(tables, new_tables, rollups=ROLLUPS):
+    # Add the rollups of new rows to existing ones; sums and counts just add up
+    merged = {}
+    for name, keys in rollups.items():
+        combined = pl.concat([tables[name], new_tables[name]])
+        totals = [pl.col(column).sum() for column in combined.columns if column not in keys]
+        merged[name] = (
+            combined.select(totals) if not keys else combined.group_by(keys).agg(totals)
+        ).cast(tables[name].schema)
+    return merged
+
+
+def save_rollups(store_dir, tables, rollups=ROLLUPS, files=None):
+    # Write the rollups into the store and record them in its manifest, along
+    # with the store files they cover (all of them by default)
+    rollup_dir = _rollup_dir(store_dir)
+    tmp_dir = f'{rollup_dir}.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, table in tables.items():
+        table.write_parquet(os.path.join(tmp_dir, f'{name}.parquet'))
+    shutil.rmtree(rollup_dir, ignore_errors=True)
+    os.replace(tmp_dir, rollup_dir)
+
+    manifest = read_manifest(store_dir)
+    manifest['rollups'] = {
+        'version': ROLLUP_VERSION,
+        'keys': rollups,
+        'files': list(manifest['files'] if files is None else files),
+    }
+    write_manifest(store_dir, manifest)
+
+
+def load_rollups(store_dir, rollups=ROLLUPS):
+    # The saved rollups and the store files they cover, or (None, None) if they
+    # are missing, were built differently or don't record the files they cover
+    manifest = read_manifest(store_dir)
+    saved = (manifest or {}).get('rollups')
+    if saved is None or saved.get('version') != ROLLUP_VERSION or saved.get('keys') != rollups:
+        return None, None
+    if saved.get('files') is None:
+        return None, None
+    try:
+        tables = {name: pl.read_parquet(os.path.join(_rollup_dir(store_dir), f'{name}.parquet')) for name in rollups}
+    except OSError:
+        return None, None
+    return tables, saved['files']
+
+
+def open_rollups(store_dir, frame=None, rollups=ROLLUPS, built=None):
+    # Load the rollups saved in the store, bringing them up to date first
+    # Files appended to the store since they were saved are aggregated on their
+    # own and added in; otherwise (or if files were removed) they are rebuilt
+    # from frame, which defaults to a scan of the store.
+    # Pass a list as built to get the store files that were aggregated.
+    files = read_manifest(store_dir)['files']
+    tables, covered = load_rollups(store_dir, rollups)
+    if tables is not None and set(covered) <= set(files):
+        new_files = [path for path in files if path not in covered]
+        if not new_files:
+            return tables
+        tables = merge_rollups(tables, build_rollups(scan_store(store_dir, new_files), rollups), rollups)
+    else:
+        new_files = files
+        tables = build_rollups(frame if frame is not None else scan_store(store_dir), rollups)
+    save_rollups(store_dir, tables, rollups, files)
+    if built is not None:
+        built.extend(new_files)
+    return tables
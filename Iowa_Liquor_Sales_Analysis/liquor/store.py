@@ -0,0 +1,248 @@
+import json
+import os
+import shutil
+from datetime import date
+
+import polars as pl
+
+# One-time conversion of the cleaned, categorized sales to Parquet, laid out as
+#   <store>/Year=2012/part-0.parquet
+#   <store>/Year=2013/part-0.parquet ...
+# with min/max statistics for every row group. Rows are sorted by Date inside
+# each file, so a Date filter skips whole partitions and row groups, and a query
+# only reads the columns it selects. The manifest lists the data files, so other
+# Parquet files kept in the store (such as the rollups) are never scanned as sales.
+# New months can be appended as extra part-N.parquet files in their partitions.
+# The manifest also keeps a profile of the raw file (row counts, null counts and
+# the first rows), so a run against a current store never has to read the CSV.
+
+# Bump whenever the cleaning or categorization changes so stores get rebuilt
+STORE_VERSION = 4
+
+PARTITION_BY = ["Year"]
+
+# Smaller row groups give the Date statistics a finer grain to skip on
+ROW_GROUP_SIZE = 256 * 1024
+
+
+def default_store_dir(data_file):
+    # Iowa_Liquor_Sales-26M.csv.gz -> Iowa_Liquor_Sales-26M_parquet, next to the file
+    base = os.path.basename(data_file)
+    for extension in ('.gz', '.csv'):
+        if base.endswith(extension):
+            base = base[:-len(extension)]
+    return os.path.join(os.path.dirname(os.path.abspath(data_file)), f'{base}_parquet')
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, 'manifest.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(store_dir, manifest):
+    tmp_path = os.path.join(store_dir, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, os.path.join(store_dir, 'manifest.json'))
+
+
+def _partition_path(store_dir, partition_by, values):
+    return os.path.join(store_dir, *[f'{column}={value}' for column, value in zip(partition_by, values)])
+
+
+def _next_part_path(partition_dir):
+    # part-0.parquet for a new partition, part-1.parquet for its first append, ...
+    existing = [name for name in os.listdir(partition_dir) if name.startswith('part-')]
+    return os.path.join(partition_dir, f'part-{len(existing)}.parquet')
+
+
+def _write_partition_files(frame, store_dir, partition_by, rows, files):
+    # Write a frame as one sorted Parquet file per partition, adding the row
+    # counts and new file paths to rows and files. The frame is staged to a single
+    # Parquet file first with a streaming sink, then each partition is read back
+    # from it, sorted by Date and written out.
+    # Returns the staged schema, the new files and the latest Date written.
+    os.makedirs(store_dir, exist_ok=True)
+    staging_path = os.path.join(store_dir, '_staging.parquet')
+    frame.lazy().sink_parquet(staging_path)
+
+    staged = pl.scan_parquet(staging_path)
+    schema = staged.collect_schema()
+    partitions = staged.select(partition_by).unique().sort(partition_by).collect().rows()
+    max_date = staged.select(pl.col("Date").max()).collect().item()
+
+    new_files = []
+    for values in partitions:
+        predicate = pl.all_horizontal([pl.col(column) == value for column, value in zip(partition_by, values)])
+        partition = staged.filter(predicate).sort("Date").drop(partition_by).collect()
+        partition_dir = _partition_path(store_dir, partition_by, values)
+        os.makedirs(partition_dir, exist_ok=True)
+        partition_file = _next_part_path(partition_dir)
+        partition.write_parquet(partition_file, statistics=True, row_group_size=ROW_GROUP_SIZE)
+        key = '/'.join(str(value) for value in values)
+        rows[key] = rows.get(key, 0) + partition.height
+        new_files.append(os.path.relpath(partition_file, store_dir))
+
+    os.remove(staging_path)
+    files.extend(new_files)
+    return schema, new_files, max_date
+
+
+def write_partitions(frame, store_dir, partition_by=PARTITION_BY):
+    # Write a cleaned frame as one sorted Parquet file per partition
+    rows = {}
+    files = []
+    schema, _, max_date = _write_partition_files(frame, store_dir, partition_by, rows, files)
+    return {
+        'partition_by': list(partition_by),
+        'hive_schema': {column: str(schema[column]) for column in partition_by},
+        'partitions': rows,
+        'files': files,
+        'rows': sum(rows.values()),
+        'max_date': max_date.isoformat() if max_date is not None else None,
+    }
+
+
+def convert_to_parquet(data_file, frame, store_dir=None, partition_by=PARTITION_BY):
+    # Convert the cleaned, categorized frame (eager or lazy) built from data_file
+    # into a partitioned Parquet store. The store is written to a temporary
+    # directory and swapped in at the end, so a failed run leaves no partial store.
+    store_dir = store_dir or default_store_dir(data_file)
+    tmp_dir = f'{store_dir}.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    manifest = {
+        'store_version': STORE_VERSION,
+        'source': os.path.basename(data_file),
+        'source_fingerprint': source_fingerprint(data_file),
+    }
+    manifest.update(write_partitions(frame, tmp_dir, partition_by))
+    write_manifest(tmp_dir, manifest)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+    return manifest
+
+
+def is_current(data_file, store_dir=None, partition_by=PARTITION_BY):
+    # True when the store was built from this exact version of data_file
+    manifest = read_manifest(store_dir or default_store_dir(data_file))
+    return (
+        manifest is not None
+        and manifest.get('store_version') == STORE_VERSION
+        and manifest.get('source_fingerprint') == source_fingerprint(data_file)
+        and manifest.get('partition_by') == list(partition_by)
+    )
+
+
+def _frame_to_json(frame):
+    return {
+        'schema': {column: str(dtype) for column, dtype in frame.schema.items()},
+        'columns': frame.to_dict(as_series=False),
+    }
+
+
+def _frame_from_json(data):
+    return pl.DataFrame(data['columns'], schema={column: getattr(pl, dtype) for column, dtype in data['schema'].items()})
+
+
+def save_profile(store_dir, profile):
+    # Record a profile of the raw file the store was built from in its manifest:
+    # original_rows, cleaned_rows and size_bytes, and the null_counts and head frames
+    manifest = read_manifest(store_dir)
+    manifest['profile'] = {
+        key: _frame_to_json(value) if isinstance(value, pl.DataFrame) else value
+        for key, value in profile.items()
+    }
+    write_manifest(store_dir, manifest)
+
+
+def read_profile(store_dir):
+    # The profile saved with the store, or None if it has none
+    saved = (read_manifest(store_dir) or {}).get('profile')
+    if saved is None:
+        return None
+    return {
+        key: _frame_from_json(value) if isinstance(value, dict) else value
+        for key, value in saved.items()
+    }
+
+
+def scan_store(store_dir, files=None):
+    # Lazily scan a store, or just some of its files; partition columns come
+    # back from the directory names
+    manifest = read_manifest(store_dir)
+    hive_schema = {column: getattr(pl, dtype) for column, dtype in manifest['hive_schema'].items()}
+    return pl.scan_parquet(
+        [os.path.join(store_dir, path) for path in (manifest['files'] if files is None else files)],
+        hive_partitioning=True,
+        hive_schema=hive_schema,
+    )
+
+
+def can_append(frame, store_dir, partition_by=PARTITION_BY):
+    # True when frame's rows can be added to the existing store: same version,
+    # same partitioning and the same columns and types
+    manifest = read_manifest(store_dir)
+    if (
+        manifest is None
+        or manifest.get('store_version') != STORE_VERSION
+        or manifest.get('partition_by') != list(partition_by)
+        or manifest.get('max_date') is None
+    ):
+        return False
+    return dict(frame.lazy().collect_schema()) == dict(scan_store(store_dir).collect_schema())
+
+
+def append_to_store(data_file, frame, store_dir=None):
+    # Add the rows of frame dated after the last Date in the store, as new files
+    # in their partitions, and record data_file as the store's source. Existing
+    # files are never rewritten, and the new files only become part of the store
+    # when the manifest is replaced at the end.
+    # Returns the new files (relative to store_dir).
+    store_dir = store_dir or default_store_dir(data_file)
+    manifest = read_manifest(store_dir)
+    last_date = date.fromisoformat(manifest['max_date'])
+    new_rows = frame.lazy().filter(pl.col("Date") > last_date)
+
+    _, new_files, max_date = _write_partition_files(
+        new_rows, store_dir, manifest['partition_by'], manifest['partitions'], manifest['files'],
+    )
+    manifest['rows'] = sum(manifest['partitions'].values())
+    if max_date is not None:
+        manifest['max_date'] = max_date.isoformat()
+    manifest['source'] = os.path.basename(data_file)
+    manifest['source_fingerprint'] = source_fingerprint(data_file)
+    write_manifest(store_dir, manifest)
+    return new_files
+
+
+def open_sales_store(data_file, frame, store_dir=None, partition_by=PARTITION_BY, converted=None, append=False, appended=None,
+                     profile=None):
+    # Scan the Parquet store for data_file, converting frame into it first if the
+    # store is missing or was built from a different version of the file.
+    # With append, a store built from an earlier version of the file only gets
+    # the rows dated after its last Date, e.g. newly published months.
+    # A profile of the raw file (see save_profile), if given, is saved with it.
+    # Pass lists as converted / appended to find out what ran.
+    store_dir = store_dir or default_store_dir(data_file)
+    if not is_current(data_file, store_dir, partition_by):
+        if append and can_append(frame, store_dir, partition_by):
+            new_files = append_to_store(data_file, frame, store_dir)
+            if appended is not None:
+                appended.extend(new_files)
+        else:
+            convert_to_parquet(data_file, frame, store_dir, partition_by)
+            if converted is not None:
+                converted.append(store_dir)
+    if profile is not None:
+        save_profile(store_dir, profile)
+    return scan_store(store_dir)
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+
+from liquor.rollups import ROLLUPS, build_rollups, open_rollups
+from liquor.store import convert_to_parquet, open_sales_store
+
+CITIES = [("DES MOINES", "POLK"), ("AMES", "STORY"), ("IOWA CITY", "JOHNSON")]
+CATEGORIES = [("VODKA", "TITOS HANDMADE VODKA"), ("WHISKY", "CROWN ROYAL"), ("RUM", "CAPTAIN MORGAN")]
+
+
+def sales_frame(days):
+    # A cleaned, categorized frame of a few sales a day from late 2016 on
+    rows = []
+    for day in range(days):
+        sale_date = date(2016, 12, 20) + timedelta(days=day)
+        for sale in range(3):
+            city, county = CITIES[(day + sale) % len(CITIES)]
+            category, item = CATEGORIES[(day * sale) % len(CATEGORIES)]
+            rows.append({
+                "Date": sale_date,
+                "Year": sale_date.year,
+                "Quarter": (sale_date.month - 1) // 3 + 1,
+                "Sale (Dollars)": 10.5 * (sale + 1) + day,
+                "Bottles Sold": sale + 1,
+                "Major Category": category,
+                "Item Description": item,
+                "County": county,
+                "City": city,
+                "IsWeekend": sale_date.weekday() >= 5,
+            })
+    return pl.DataFrame(rows).with_columns(pl.col("Year").cast(pl.Int32), pl.col("Quarter").cast(pl.Int8))
+
+
+def sorted_frame(frame):
+    return frame.select(sorted(frame.columns)).sort(["Date", "Sale (Dollars)"])
+
+
+def sorted_rollup(table, keys):
+    return table.sort(keys) if keys else table
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "Iowa_Liquor_Sales.csv"
+    path.write_text("first version\n")
+    return str(path)
+
+
+def publish(data_file, text):
+    # Stand in for a newer release of the data file
+    with open(data_file, "a") as f:
+        f.write(text)
+
+
+def test_append_adds_only_the_newer_rows(data_file, tmp_path):
+    store_dir = str(tmp_path / "store")
+    full = sales_frame(30)
+    early = full.filter(pl.col("Date") <= date(2016, 12, 31))
+    convert_to_parquet(data_file, early, store_dir)
+
+    converted, appended = [], []
+    open_sales_store(data_file, full, store_dir, append=True, converted=converted, appended=appended)
+    assert converted == [] and appended == []
+
+    publish(data_file, "second version\n")
+    scan = open_sales_store(data_file, full, store_dir, append=True, converted=converted, appended=appended)
+    assert converted == []
+    assert appended == ["Year=2017/part-0.parquet"]
+    assert sorted_frame(scan.collect()).equals(sorted_frame(full))
+
+
+def test_rollups_add_the_appended_files(data_file, tmp_path):
+    store_dir = str(tmp_path / "store")
+    full = sales_frame(30)
+    convert_to_parquet(data_file, full.filter(pl.col("Date") <= date(2017, 1, 5)), store_dir)
+    built = []
+    open_rollups(store_dir, built=built)
+    assert built == ["Year=2016/part-0.parquet", "Year=2017/part-0.parquet"]
+
+    built = []
+    open_rollups(store_dir, built=built)
+    assert built == []
+
+    publish(data_file, "second version\n")
+    appended = []
+    open_sales_store(data_file, full, store_dir, append=True, appended=appended)
+    tables = open_rollups(store_dir, built=built)
+    assert built == appended == ["Year=2017/part-1.parquet"]
+
+    expected = build_rollups(full)
+    for name, keys in ROLLUPS.items():
+        assert sorted_rollup(tables[name], keys).equals(sorted_rollup(expected[name], keys))
@@ -9,10 +9,7 @@ def _():
     import marimo as mo
     import pathlib
     import json
-    import os
-    import re
-    import statistics
-    return json, mo, os, re, statistics
+    return json, mo
 
 
 @app.cell(hide_code=True)
@@ -83,38 +80,82 @@ def _(mo):
         r"""
     ## Data Loading
     Load all game data from JSON files organized by week.
+    Each game's top-level keys and first video are kept in the week caches under `.season_cache/`,
+    so a run with current caches parses no game files; any other key is read from the file when first used.
+    Weeks whose files changed are parsed in parallel across a process pool when more than one core is available.
     """
     )
     return
 
 
 @app.cell
-def _(json, os):
-    def load_game_data():
-        # Initialize dictionary to store all game data
-        game_dict = {}
-        game_weeks = [
-            "Bowl", "Week 1", "Week 2", "Week 3", "Week 4", "Week 5",
-            "Week 6", "Week 7", "Week 8", "Week 9", "Week 10", "Week 11",
-            "Week 12", "Week 13", "Week 14", "Week 15"
-        ]
-        for week in game_weeks:
-            week_path = f'2017 Alabama football JSON/{week}/full'
+def _():
+    from football.answers import default_workers
+    from football.cache import load_season_games
 
-            for file in os.listdir(week_path):
+    # Spread file reading and parsing across a process pool
+    # A pool only pays off with more than one core, so fall back to a serial load
+    load_workers = default_workers()
+    # Files are parsed from raw bytes; 'orjson' or 'msgspec' parse them 2-2.5x
+    # faster than the standard library when installed
+    json_decoder = 'json'
+    # The questions over game_dict only need each game's keys and first video,
+    # which the week caches keep; drives and plays come from the cached tables
+    parsed_weeks = []
+    game_dict = load_season_games(workers=load_workers, rebuilt=parsed_weeks, decoder=json_decoder)
 
-                game_dict[file] = {}
+    print(f"Loaded {len(game_dict)} games with {load_workers or 'no'} worker(s) and the {json_decoder} decoder")
+    print(f"Parsed weeks: {parsed_weeks if parsed_weeks else 'none (loaded from cache)'}")
+    return game_dict, json_decoder
 
 
-                with open(f'{week_path}/{file}', 'r') as path:
-                    json_bytes = path.read()
-                    game_data = json.loads(json_bytes)
-                    game_dict[file].update(game_data)
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Play-by-Play Tables
+    Flatten every game once into typed Polars tables (games, teams, drives, plays, scoring_plays).
+    The question cells below query these tables instead of looping over `game_dict` again.
+    The tables are cached as Parquet under `.season_cache/`, keyed by each game file's size and modification time.
+    A shared game index lists the games in the order they were played (Week 1 through Bowl),
+    and a team index maps each team to its games and drives.
+    """
+    )
+    return
 
-        return game_dict
 
-    game_dict = load_game_data()
-    return (game_dict,)
+@app.cell
+def _(json_decoder):
+    from football.cache import load_season_tables
+
+    # Tables are cached as Parquet per week, so only weeks whose files changed get re-parsed
+    rebuilt_weeks = []
+    season_tables = load_season_tables(rebuilt=rebuilt_weeks, decoder=json_decoder)
+    print(f"Re-parsed weeks: {rebuilt_weeks if rebuilt_weeks else 'none (loaded from cache)'}")
+    for _name, _table in season_tables.items():
+        print(f"{_name}: {_table.height:,} rows x {_table.width} columns")
+    return rebuilt_weeks, season_tables
+
+
+@app.cell
+def _(game_dict, season_tables):
+    from football.index import GameIndex
+
+    # Shared chronological index of the season: week -> game ids -> parsed game
+    game_index = GameIndex(season_tables['games'], game_dict)
+    print(f"Indexed {len(game_index.game_ids())} games across {len(game_index.weeks)} weeks")
+    return (game_index,)
+
+
+@app.cell
+def _(season_tables):
+    from football.index import TeamIndex
+
+    # Inverted index from each team to its games and drives, so per-team
+    # questions only touch that team's games
+    team_index = TeamIndex(season_tables)
+    print(f"Indexed {len(team_index.teams())} teams")
+    return (team_index,)
 
 
 @app.cell(hide_code=True)
@@ -131,8 +172,10 @@ def _(mo):
 
 @app.cell
 def _(game_dict):
+    from football.queries import count_games
+
     # Count the number of games in the dataset
-    q1 = len(game_dict)
+    q1 = count_games(game_dict)
     print(f"Number of games in dataset: {q1}")
     return (q1,)
 
@@ -152,10 +195,10 @@ def _(mo):
 
 @app.cell
 def _(game_dict):
-    # Get the top-level keys from any game file
-    # Get the first game in the dictionary
-    first_game_file = list(game_dict.keys())[0]
-    q2 = list(game_dict[first_game_file].keys())
+    from football.queries import get_top_level_keys
+
+    # Get the top-level keys from the first game file
+    q2 = get_top_level_keys(game_dict)
     print(f"Top-level keys: {q2}")
     return (q2,)
 
@@ -189,36 +232,11 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict, re):
-    def check_team_consistency():
-        # Check if teams are referenced consistently
-        # Extract team names from filenames and compare with team names in game data
-        teams_from_filenames = set()
-        teams_from_gamedata = set()
-
-        for filename, game_data in game_dict.items():
-            match = re.search(r' - (.+) vs (.+)\.json', filename)
-            if match:
-                teams_from_filenames.add(match.group(1))
-                teams_from_filenames.add(match.group(2))
-            if 'teams' in game_data:
-                for team_data in game_data['teams']:
-                    if 'team' in team_data and 'displayName' in team_data['team']:
-                        teams_from_gamedata.add(team_data['team']['displayName'])
-
-        inconsistencies = []
-        for team in teams_from_filenames:
-            found = False
-            for gd_team in teams_from_gamedata:
-                if team.replace('_', '&') == gd_team or team.replace('_', ' and ') == gd_team or team == gd_team:
-                    found = True
-                    break
-            if not found:
-                inconsistencies.append(team)
-
-        return 'no' if inconsistencies else 'yes'
-
-    q3 = check_team_consistency()
+def _(team_index):
+    from football.queries import check_team_consistency
+
+    # Compare team names in the filenames with the names in the team index
+    q3 = check_team_consistency(team_index)
     print(f"Teams referenced consistently? {q3}")
     return (q3,)
 
@@ -235,20 +253,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def get_all_teams():
-        # Get all unique teams from the game data and sort alphabetically
-        teams = set()
-
-        for game_data in game_dict.values():
-            if 'teams' in game_data:
-                for team_data in game_data['teams']:
-                    if 'team' in team_data and 'displayName' in team_data['team']:
-                        teams.add(team_data['team']['displayName'])
-
-        return sorted(list(teams))
+def _(team_index):
+    from football.queries import get_all_teams
 
-    q3_1 = get_all_teams()
+    q3_1 = get_all_teams(team_index)
     print(f"Number of unique teams: {len(q3_1)}")
     print(f"Teams: {q3_1}")
     return (q3_1,)
@@ -271,27 +279,9 @@ def _(mo):
 
 @app.cell
 def _(game_dict):
-    def assess_data_reliability():
-        # Assess data reliability by checking for duplicates and consistency
-        # Check if all game IDs are unique (they should be from the filenames)
-        game_ids = []
-        for filename in game_dict.keys():
-            game_id = filename.split(' - ')[0]
-            game_ids.append(game_id)
-        unique_ids = len(set(game_ids))
-        total_ids = len(game_ids)
-        games_with_complete_data = 0
-        for game_data in game_dict.values():
-            if 'gameInfo' in game_data and 'drives' in game_data and 'scoringPlays' in game_data:
-                games_with_complete_data += 1
-        has_duplicates = unique_ids != total_ids
-        completeness_rate = games_with_complete_data / total_ids
-
-        q4 = 'yes' if not has_duplicates and completeness_rate > 0.95 else 'no'
-        q4_1 = f"The dataset contains {total_ids} games with {unique_ids} unique game IDs. {games_with_complete_data} games ({completeness_rate*100:.1f}%) have complete data including gameInfo, drives, and scoringPlays sections."
-        return q4, q4_1
-
-    q4, q4_1 = assess_data_reliability()
+    from football.queries import assess_data_reliability
+
+    q4, q4_1 = assess_data_reliability(game_dict)
     print(f"Data seems reliable? {q4}")
     print(f"{q4_1}")
     return q4, q4_1
@@ -334,52 +324,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def analyze_field_goals():
-        # Analyze field goal success rates
-        # Count field goal attempts from drives
-        alabama_fg_attempts = {'made': 0, 'missed': 0}
-        all_teams_fg = {}
-
-        for game_data in game_dict.values():
-            if 'drives' in game_data and 'previous' in game_data['drives']:
-                for drive in game_data['drives']['previous']:
-                    team_data = drive.get('team', {})
-                    team_name = team_data.get('displayName') if isinstance(team_data, dict) else team_data
-                    if team_name and 'plays' in drive:
-                        if team_name not in all_teams_fg:
-                            all_teams_fg[team_name] = {'made': 0, 'missed': 0}
-
-                        for play in drive['plays']:
-                            if 'type' in play and 'text' in play:
-                                play_type_data = play.get('type', {})
-                                play_type = play_type_data.get('text', '') if isinstance(play_type_data, dict) else str(play_type_data)
-                                play_text = play['text']
-                                if 'field goal' in play_type.lower():
-                                    # Check play_type for "good" or "missed", not play_text
-                                    if 'good' in play_type.lower():
-                                        all_teams_fg[team_name]['made'] += 1
-                                        if team_name == 'Alabama Crimson Tide':
-                                            alabama_fg_attempts['made'] += 1
-                                    elif 'missed' in play_type.lower() or 'no good' in play_type.lower():
-                                        all_teams_fg[team_name]['missed'] += 1
-                                        if team_name == 'Alabama Crimson Tide':
-                                            alabama_fg_attempts['missed'] += 1
-        alabama_total_attempts = alabama_fg_attempts['made'] + alabama_fg_attempts['missed']
-        alabama_success_rate = alabama_fg_attempts['made'] / alabama_total_attempts if alabama_total_attempts > 0 else 0
-        all_rates = []
-        for team, stats in all_teams_fg.items():
-            total = stats['made'] + stats['missed']
-            if total > 0:
-                success_rate = stats['made'] / total
-                all_rates.append(success_rate)
-
-        avg_rate = sum(all_rates) / len(all_rates) if all_rates else 0
-        q6 = 'yes' if alabama_success_rate < avg_rate else 'no'
-        q6_1 = f"Alabama attempted {alabama_total_attempts} field goals, making {alabama_fg_attempts['made']} and missing {alabama_fg_attempts['missed']} for a {alabama_success_rate*100:.1f}% success rate. The average success rate across all teams was {avg_rate*100:.1f}%."
-        return q6, q6_1
-
-    q6, q6_1 = analyze_field_goals()
+def _(season_tables):
+    from football.queries import analyze_field_goals
+
+    q6, q6_1 = analyze_field_goals(season_tables)
     print(f"Does Alabama miss more field goals than average? {q6}")
     print(f"{q6_1}")
     return q6, q6_1
@@ -403,27 +351,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def count_safety_games():
-        # Count games where a safety occurred
-        games_with_safety = 0
-
-        for game_data in game_dict.values():
-            has_safety = False
-            if 'scoringPlays' in game_data:
-                for play in game_data['scoringPlays']:
-                    if 'scoringType' in play:
-                        scoring_type_data = play.get('scoringType', {})
-                        scoring_type = scoring_type_data.get('name', '') if isinstance(scoring_type_data, dict) else str(scoring_type_data)
-                        if scoring_type == 'safety' or 'safety' in scoring_type.lower():
-                            has_safety = True
-                            break
-            if has_safety:
-                games_with_safety += 1
-
-        return games_with_safety
-
-    q7 = count_safety_games()
+def _(season_tables):
+    from football.queries import count_safety_games
+
+    q7 = count_safety_games(season_tables)
     print(f"Number of games with a safety: {q7}")
     return (q7,)
 
@@ -442,47 +373,20 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def track_safeties():
-        # Track safeties scored and given up by each team
-        safeties_scored = {}  
-        safeties_given_up = {}  
-
-        for game_data in game_dict.values():
-            if 'scoringPlays' in game_data:
-                for play in game_data['scoringPlays']:
-                    if 'scoringType' in play:
-                        scoring_type_data = play.get('scoringType', {})
-                        scoring_type = scoring_type_data.get('name', '') if isinstance(scoring_type_data, dict) else str(scoring_type_data)
-                        if scoring_type == 'safety' or 'safety' in scoring_type.lower():
-                            # The team that scored the safety
-                            team_data = play.get('team', {})
-                            scoring_team = team_data.get('displayName') if isinstance(team_data, dict) else team_data
-                            if scoring_team:
-                                safeties_scored[scoring_team] = safeties_scored.get(scoring_team, 0) + 1
-
-                            if 'teams' in game_data:
-                                for team_info in game_data['teams']:
-                                    team_obj = team_info.get('team', {})
-                                    team_name = team_obj.get('displayName') if isinstance(team_obj, dict) else team_obj
-                                    if team_name and team_name != scoring_team:
-                                        safeties_given_up[team_name] = safeties_given_up.get(team_name, 0) + 1
-
-        return {'scored': safeties_scored, 'given_up': safeties_given_up}
-
-    safety_dict = track_safeties()
+def _(season_tables):
+    from football.queries import track_safeties
+
+    # Track safeties scored and given up by each team
+    safety_dict = track_safeties(season_tables)
     return (safety_dict,)
 
 
 @app.cell
 def _(safety_dict):
+    from football.queries import most_safeties_scored
+
     # Find team(s) that scored the most safeties
-    if safety_dict['scored']:
-        max_safeties = max(safety_dict['scored'].values())
-        teams_with_most = [team for team, count in safety_dict['scored'].items() if count == max_safeties]
-        q8 = teams_with_most if len(teams_with_most) > 1 else teams_with_most[0]
-    else:
-        q8 = []
+    q8 = most_safeties_scored(safety_dict)
     print(f"Team(s) that scored the most safeties: {q8}")
     return (q8,)
 
@@ -500,13 +404,10 @@ def _(mo):
 
 @app.cell
 def _(safety_dict):
+    from football.queries import most_safeties_given_up
+
     # Find the three teams that gave up the most safeties
-    if safety_dict['given_up']:
-        sorted_teams = sorted(safety_dict['given_up'].items(), key=lambda x: x[1], reverse=True)
-        top_3_teams = [team for team, count in sorted_teams[:3]]
-        q9 = top_3_teams
-    else:
-        q9 = []
+    q9 = most_safeties_given_up(safety_dict)
     print(f"Top 3 teams that gave up the most safeties: {q9}")
     return (q9,)
 
@@ -531,64 +432,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict, re):
-    def find_longest_plays():
-        # Find the longest play(s) in the season
-        longest_plays = []
-        max_yards = 0
-
-        for filename, game_data in game_dict.items():
-            match = re.search(r' - (.+) vs (.+)\.json', filename)
-            matchup = match.group(0) if match else filename
-
-            if 'drives' in game_data and 'previous' in game_data['drives']:
-                for drive in game_data['drives']['previous']:
-                    if 'plays' in drive:
-                        for play in drive['plays']:
-                            yardage = 0
-
-                            # Get yardage from statYardage, but validate it's realistic
-                            if 'statYardage' in play:
-                                stat_yards = abs(play['statYardage'])
-                                # Filter out unrealistic values (max play in football is ~109 yards)
-                                if stat_yards <= 110:
-                                    yardage = stat_yards
-
-                            # If statYardage is missing or unrealistic, try to extract from text
-                            if yardage == 0 and 'text' in play:
-                                yards_match = re.search(r'(\d+)\s*yd', play['text'], re.IGNORECASE)
-                                if yards_match:
-                                    yardage = int(yards_match.group(1))
-
-                            if yardage > max_yards:
-                                max_yards = yardage
-                                period_data = play.get('period', {})
-                                quarter = period_data.get('number', 'Unknown') if isinstance(period_data, dict) else period_data
-                                clock_data = play.get('clock', {})
-                                clock = clock_data.get('displayValue', 'Unknown') if isinstance(clock_data, dict) else clock_data
-                                longest_plays = [{
-                                    'matchup': matchup,
-                                    'quarter': quarter,
-                                    'clock': clock,
-                                    'description': play.get('text', 'No description'),
-                                    'yards': yardage
-                                }]
-                            elif yardage == max_yards and yardage > 0:
-                                period_data = play.get('period', {})
-                                quarter = period_data.get('number', 'Unknown') if isinstance(period_data, dict) else period_data
-                                clock_data = play.get('clock', {})
-                                clock = clock_data.get('displayValue', 'Unknown') if isinstance(clock_data, dict) else clock_data
-                                longest_plays.append({
-                                    'matchup': matchup,
-                                    'quarter': quarter,
-                                    'clock': clock,
-                                    'description': play.get('text', 'No description'),
-                                    'yards': yardage
-                                })
-
-        return longest_plays
-
-    q10 = find_longest_plays()
+def _(season_tables):
+    from football.queries import find_longest_plays
+
+    q10 = find_longest_plays(season_tables)
     print(f"Longest play(s) in the season:")
     for play in q10:
         print(f"  {play['yards']} yards - {play['description']}")
@@ -612,52 +459,12 @@ def _(mo):
 
 
 @app.cell
-def _(json, os):
+def _(game_index, team_index):
+    from football.queries import get_alabama_plays
+
     # Find Alabama's first and last offensive plays
-    # Need to identify all Alabama games and find first/last plays chronologically
-
-    def get_alabama_plays():
-        game_weeks_order = [
-            "Week 1", "Week 2", "Week 3", "Week 4", "Week 5",
-            "Week 6", "Week 7", "Week 8", "Week 9", "Week 10", "Week 11",
-            "Week 12", "Week 13", "Week 14", "Week 15", "Bowl"
-        ]
-
-        alabama_plays = []
-
-        for week in game_weeks_order:
-            week_path = f'2017 Alabama football JSON/{week}/full'
-            if os.path.exists(week_path):
-                for file in os.listdir(week_path):
-                    if 'Alabama' in file:
-                        filepath = f'{week_path}/{file}'
-                        with open(filepath, 'r') as f:
-                            game_data = json.load(f)
-
-                        if 'drives' in game_data and 'previous' in game_data['drives']:
-                            for drive in game_data['drives']['previous']:
-                                team_data = drive.get('team', {})
-                                team_name = team_data.get('displayName', '') if isinstance(team_data, dict) else str(team_data)
-                                if 'Alabama' in team_name and 'plays' in drive:
-                                    for play in drive['plays']:
-                                        play_type_data = play.get('type', {})
-                                        play_type = play_type_data.get('text', '') if isinstance(play_type_data, dict) else str(play_type_data)
-                                        if play_type not in ['Kickoff', 'Timeout', 'End Period', 'End of Half']:
-                                            alabama_plays.append({
-                                                'week': week,
-                                                'description': play.get('text', ''),
-                                                'yardage': play.get('statYardage', 0)
-                                            })
-
-        first_play = alabama_plays[0] if alabama_plays else None
-        last_play = alabama_plays[-1] if alabama_plays else None
-
-        return {
-            'first_play': first_play,
-            'last_play': last_play
-        }
-
-    q11 = get_alabama_plays()
+    # The game index orders Alabama's games chronologically, so this runs from memory
+    q11 = get_alabama_plays(game_index, team_index)
     print(f"Alabama's first and last offensive plays:")
     if q11['first_play']:
         print(f"  First play ({q11['first_play']['week']}): {q11['first_play']['description']}")
@@ -680,26 +487,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def count_alabama_punts():
-        # Count Alabama punts
-        alabama_punts = 0
-
-        for game_data in game_dict.values():
-            if 'drives' in game_data and 'previous' in game_data['drives']:
-                for drive in game_data['drives']['previous']:
-                    team_data = drive.get('team', {})
-                    team_name = team_data.get('displayName', '') if isinstance(team_data, dict) else str(team_data)
-                    if 'Alabama' in team_name and 'plays' in drive:
-                        for play in drive['plays']:
-                            play_type_data = play.get('type', {})
-                            play_type = play_type_data.get('text', '') if isinstance(play_type_data, dict) else str(play_type_data)
-                            if 'punt' in play_type.lower():
-                                alabama_punts += 1
-
-        return alabama_punts
-
-    q12 = count_alabama_punts()
+def _(team_index):
+    from football.queries import count_alabama_punts
+
+    q12 = count_alabama_punts(team_index)
     print(f"Alabama punted {q12} times in the 2017 season")
     return (q12,)
 
@@ -719,35 +510,10 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict, re, statistics):
-    def calculate_punt_statistics():
-        # Calculate punt distance statistics
-        punt_distances = []
-
-        for game_data in game_dict.values():
-            if 'drives' in game_data and 'previous' in game_data['drives']:
-                for drive in game_data['drives']['previous']:
-                    if 'plays' in drive:
-                        for play in drive['plays']:
-                            play_type_data = play.get('type', {})
-                            play_type = play_type_data.get('text', '') if isinstance(play_type_data, dict) else str(play_type_data)
-                            play_text = play.get('text', '')
-                            if 'punt' in play_type.lower():
-                                yards_match = re.search(r'punt.*?(\d+)\s*yds?', play_text, re.IGNORECASE)
-                                if yards_match:
-                                    distance = int(yards_match.group(1))
-                                    punt_distances.append(distance)
-
-        if punt_distances:
-            return {
-                'longest': max(punt_distances),
-                'shortest': min(punt_distances),
-                'median': statistics.median(punt_distances)
-            }
-        else:
-            return {'longest': 0, 'shortest': 0, 'median': 0}
-
-    q13 = calculate_punt_statistics()
+def _(season_tables):
+    from football.queries import calculate_punt_statistics
+
+    q13 = calculate_punt_statistics(season_tables)
     print(f"Punt distance statistics:")
     print(f"  Longest: {q13['longest']} yards")
     print(f"  Shortest: {q13['shortest']} yards")
@@ -777,41 +543,11 @@ def _(mo):
 
 
 @app.cell
-def _(game_dict):
-    def analyze_offensive_performance():
-        # Offensive performance analysis using Polars
-        import polars as pl
-        drives_data = []
-
-        for game_data in game_dict.values():
-            if 'drives' in game_data and 'previous' in game_data['drives']:
-                for drive in game_data['drives']['previous']:
-                    team_data = drive.get('team', {})
-                    team_name = team_data.get('displayName', '') if isinstance(team_data, dict) else str(team_data)
-                    if team_name:
-                        yards = drive.get('yards', 0)
-                        result_data = drive.get('result', {})
-                        result = result_data.get('text', '') if isinstance(result_data, dict) else str(result_data)
-                        ended_in_td = 'touchdown' in result.lower() or 'TD' in result
-                        ended_in_turnover = any(keyword in result.lower() for keyword in ['interception', 'fumble', 'turnover', 'downs'])
-
-                        drives_data.append({
-                            'team': team_name,
-                            'yards': yards,
-                            'touchdown': ended_in_td,
-                            'turnover': ended_in_turnover
-                        })
-        df_drives = pl.DataFrame(drives_data)
-        team_stats = df_drives.group_by('team').agg([
-            pl.count('yards').alias('total_drives'),
-            pl.mean('yards').alias('avg_yards_per_drive'),
-            (pl.sum('touchdown') / pl.count('yards') * 100).alias('td_percentage'),
-            (pl.sum('turnover') / pl.count('yards') * 100).alias('turnover_percentage')
-        ]).sort('avg_yards_per_drive', descending=True).head(10)
-
-        return team_stats.to_dicts()
-
-    q14 = analyze_offensive_performance()
+def _(season_tables):
+    from football.queries import analyze_offensive_performance
+
+    # Offensive performance analysis using Polars
+    q14 = analyze_offensive_performance(season_tables)
     print(f"Top 10 teams by average yards per drive:")
     for i, team in enumerate(q14, 1):
         print(f"  {i}. {team['team']}: {team['avg_yards_per_drive']:.2f} avg yards/drive")
@@ -832,22 +568,10 @@ def _(mo):
 
 @app.cell
 def _(game_dict):
+    from football.queries import get_video_from_data
+
     # Video highlight URL - extracted from JSON data
-    def get_video_from_data():
-        # Search through games for videos
-        for filename, game_data in game_dict.items():
-            if 'videos' in game_data and len(game_data['videos']) > 0:
-                video = game_data['videos'][0]
-                if 'links' in video and 'web' in video['links']:
-                    return {
-                        'url': video['links']['web']['href'],
-                        'headline': video.get('headline', 'No headline'),
-                        'description': video.get('description', 'No description'),
-                        'game': filename
-                    }
-        return None
-
-    bonus_data = get_video_from_data()
+    bonus_data = get_video_from_data(game_dict)
     bonus = bonus_data['url'] if bonus_data else "No video found"
     print(f"Video highlight URL: {bonus}")
     if bonus_data:
@@ -0,0 +1 @@
+"""Helpers for loading and analyzing the 2017 NCAA football game files."""
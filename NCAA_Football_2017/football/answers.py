@@ -0,0 +1,84 @@
+import os
+
+from football import queries
+from football.cache import CACHE_DIR, load_season_games, load_season_tables
+from football.index import GameIndex, TeamIndex
+from football.loader import DATA_DIR, DEFAULT_DECODER
+
+# The notebook's questions as plain Python, in the order its cells run.
+# Each step is (names, inputs, function): the function receives the results so
+# far, reads only the listed inputs from them, and its return value is stored
+# under names (a tuple of names unpacks a tuple). Inputs are the run parameters
+# (data_dir, cache_dir, workers, decoder) or earlier steps' names.
+# The notebook, the benchmark and headless runs all compute the answers this way.
+
+ANSWER_KEYS = [
+    'q1', 'q2', 'q3', 'q3.1', 'q4', 'q4.1', 'q5', 'q6', 'q6.1',
+    'q7', 'q8', 'q9', 'q10', 'q11', 'q12', 'q13', 'q14', 'Bonus'
+]
+
+
+def default_workers():
+    # A one-worker process pool is slower than loading serially
+    # os.cpu_count() is None when the count can't be determined
+    cpus = os.cpu_count() or 1
+    return cpus if cpus > 1 else 0
+
+
+def _bonus(game_dict):
+    bonus_data = queries.get_video_from_data(game_dict)
+    return bonus_data['url'] if bonus_data else "No video found"
+
+
+ANSWER_STEPS = [
+    ('game_dict', ['data_dir', 'cache_dir', 'workers', 'decoder'],
+     lambda r: load_season_games(r['data_dir'], r['cache_dir'], workers=r['workers'], decoder=r['decoder'])),
+    ('season_tables', ['data_dir', 'cache_dir', 'workers', 'decoder'],
+     lambda r: load_season_tables(r['data_dir'], r['cache_dir'], workers=r['workers'], decoder=r['decoder'])),
+    ('game_index', ['season_tables', 'game_dict'], lambda r: GameIndex(r['season_tables']['games'], r['game_dict'])),
+    ('team_index', ['season_tables'], lambda r: TeamIndex(r['season_tables'])),
+    ('q1', ['game_dict'], lambda r: queries.count_games(r['game_dict'])),
+    ('q2', ['game_dict'], lambda r: queries.get_top_level_keys(r['game_dict'])),
+    ('q3', ['team_index'], lambda r: queries.check_team_consistency(r['team_index'])),
+    ('q3.1', ['team_index'], lambda r: queries.get_all_teams(r['team_index'])),
+    (('q4', 'q4.1'), ['game_dict'], lambda r: queries.assess_data_reliability(r['game_dict'])),
+    ('q5', ['q3.1'], lambda r: len(r['q3.1'])),
+    (('q6', 'q6.1'), ['season_tables'], lambda r: queries.analyze_field_goals(r['season_tables'])),
+    ('q7', ['season_tables'], lambda r: queries.count_safety_games(r['season_tables'])),
+    ('safety_dict', ['season_tables'], lambda r: queries.track_safeties(r['season_tables'])),
+    ('q8', ['safety_dict'], lambda r: queries.most_safeties_scored(r['safety_dict'])),
+    ('q9', ['safety_dict'], lambda r: queries.most_safeties_given_up(r['safety_dict'])),
+    ('q10', ['season_tables'], lambda r: queries.find_longest_plays(r['season_tables'])),
+    ('q11', ['game_index', 'team_index'], lambda r: queries.get_alabama_plays(r['game_index'], r['team_index'])),
+    ('q12', ['team_index'], lambda r: queries.count_alabama_punts(r['team_index'])),
+    ('q13', ['season_tables'], lambda r: queries.calculate_punt_statistics(r['season_tables'])),
+    ('q14', ['season_tables'], lambda r: queries.analyze_offensive_performance(r['season_tables'])),
+    ('Bonus', ['game_dict'], lambda r: _bonus(r['game_dict'])),
+]
+
+
+def step_label(names):
+    return names if isinstance(names, str) else '/'.join(names)
+
+
+def run_step(results, names, function):
+    # Run one step and store its value(s) in results
+    value = function(results)
+    if isinstance(names, str):
+        results[names] = value
+    else:
+        results.update(zip(names, value))
+    return value
+
+
+def compute_answers(data_dir=DATA_DIR, cache_dir=CACHE_DIR, workers=None, decoder=DEFAULT_DECODER):
+    # Run every step and return the answer file dictionary
+    results = {
+        'data_dir': data_dir,
+        'cache_dir': cache_dir,
+        'workers': default_workers() if workers is None else workers,
+        'decoder': decoder,
+    }
+    for names, inputs, function in ANSWER_STEPS:
+        run_step(results, names, function)
+    return {key: results[key] for key in ANSWER_KEYS}
@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from football.answers import ANSWER_STEPS, default_workers, run_step, step_label
+from football.loader import DATA_DIR, DEFAULT_DECODER, JSON_DECODERS, available_decoders, compare_decoders
+
+# Benchmark every step of the notebook (loading, indexes, q1-q14, Bonus) as plain
+# Python, outside marimo. Each scenario runs in a fresh process so its peak RSS
+# is its own:
+#   cold - empty Parquet cache, so the season tables are rebuilt from JSON
+#   warm - the cache written by the cold run is reused
+# Allocations are measured with tracemalloc in a separate pass, since tracing
+# slows everything down and would distort the timings.
+#
+# --decoders also compares the parse throughput (MB/s) of every installed JSON
+# decoder, and --decoder runs the scenarios with one of them.
+#
+#   python -m football.bench --output bench_report.json
+#   python -m football.bench --output new.json --compare bench_report.json
+#   python -m football.bench --decoders --decoder orjson
+
+SCENARIOS = ['cold', 'warm']
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    # Peak resident set size of this process so far
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_steps(data_dir=DATA_DIR, cache_dir=None, workers=0, trace=False, decoder=DEFAULT_DECODER):
+    # Run the answer steps in order, timing each one
+    # With trace, also record the peak and retained Python allocations per step
+    results = {'data_dir': data_dir, 'cache_dir': cache_dir, 'workers': workers, 'decoder': decoder}
+    steps = []
+    if trace:
+        tracemalloc.start()
+
+    for names, inputs, function in ANSWER_STEPS:
+        if trace:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        run_step(results, names, function)
+        step = {
+            'step': step_label(names),
+            'seconds': time.perf_counter() - start,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            step['alloc_peak_mb'] = (peak - before) / MB
+            step['alloc_retained_mb'] = (current - before) / MB
+        steps.append(step)
+
+    if trace:
+        tracemalloc.stop()
+    return steps
+
+
+def _run_child(scenario, data_dir, cache_dir, workers, trace, decoder):
+    # Measure one scenario in a fresh interpreter and read back its steps
+    command = [
+        sys.executable, '-m', 'football.bench', '--child',
+        '--data-dir', data_dir, '--cache-dir', cache_dir, '--workers', str(workers),
+        '--decoder', decoder,
+    ]
+    if trace:
+        command.append('--trace')
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get('PYTHONPATH')])))
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark(data_dir=DATA_DIR, scenarios=SCENARIOS, workers=None, allocations=True, decoder=DEFAULT_DECODER, decoders=False):
+    # Benchmark each scenario and return a JSON-serializable report
+    # The cache lives in a temporary directory, so the notebook's cache is never touched
+    # With decoders, the report also gets the parse throughput of every installed decoder
+    workers = default_workers() if workers is None else workers
+    data_dir = os.path.abspath(data_dir)
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'data_dir': data_dir,
+        'workers': workers,
+        'decoder': decoder,
+        'scenarios': {},
+    }
+    if decoders:
+        report['decoders'] = compare_decoders(data_dir, available_decoders())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for scenario in scenarios:
+            passes = [False, True] if allocations else [False]
+            timed = traced = None
+            for trace in passes:
+                if scenario == 'cold':
+                    shutil.rmtree(cache_dir)
+                    os.makedirs(cache_dir)
+                elif not os.listdir(cache_dir):
+                    # Warm the cache first when the cold scenario didn't run
+                    _run_child('cold', data_dir, cache_dir, workers, False, decoder)
+                steps = _run_child(scenario, data_dir, cache_dir, workers, trace, decoder)
+                if trace:
+                    traced = steps
+                else:
+                    timed = steps
+
+            if traced:
+                for step, traced_step in zip(timed['steps'], traced['steps']):
+                    step['alloc_peak_mb'] = traced_step['alloc_peak_mb']
+                    step['alloc_retained_mb'] = traced_step['alloc_retained_mb']
+            report['scenarios'][scenario] = {
+                'total_seconds': sum(step['seconds'] for step in timed['steps']),
+                'peak_rss_mb': timed['peak_rss_mb'],
+                'steps': timed['steps'],
+            }
+    return report
+
+
+def compare_reports(baseline, current):
+    # Per-step timing ratios (current / baseline) for the scenarios both reports ran
+    rows = []
+    for scenario, run in current['scenarios'].items():
+        base_run = baseline['scenarios'].get(scenario)
+        if base_run is None:
+            continue
+        base_steps = {step['step']: step for step in base_run['steps']}
+        for step in run['steps'] + [{'step': 'total', 'seconds': run['total_seconds'], 'peak_rss_mb': run['peak_rss_mb']}]:
+            base_step = base_steps.get(step['step'])
+            if step['step'] == 'total':
+                base_step = {'seconds': base_run['total_seconds'], 'peak_rss_mb': base_run['peak_rss_mb']}
+            if base_step is None:
+                continue
+            rows.append({
+                'scenario': scenario,
+                'step': step['step'],
+                'baseline_seconds': base_step['seconds'],
+                'seconds': step['seconds'],
+                'ratio': step['seconds'] / base_step['seconds'] if base_step['seconds'] else None,
+                'baseline_peak_rss_mb': base_step['peak_rss_mb'],
+                'peak_rss_mb': step['peak_rss_mb'],
+            })
+    return rows
+
+
+def format_report(report):
+    lines = []
+    for name, result in report.get('decoders', {}).items():
+        lines.append(f"decoder {name:<8} {result['mb_per_s']:7.1f} MB/s  ({result['seconds']:.2f}s to parse the season)")
+    for scenario, run in report['scenarios'].items():
+        lines.append(f"{scenario}: {run['total_seconds']:.2f}s, peak RSS {run['peak_rss_mb']:.0f} MB")
+        for step in run['steps']:
+            alloc = f", alloc peak {step['alloc_peak_mb']:.1f} MB" if 'alloc_peak_mb' in step else ''
+            lines.append(f"  {step['step']:<14} {step['seconds']:8.3f}s  RSS {step['peak_rss_mb']:6.0f} MB{alloc}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows):
+    lines = []
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else 'n/a'
+        lines.append(
+            f"{row['scenario']:<5} {row['step']:<14} {row['baseline_seconds']:8.3f}s -> {row['seconds']:8.3f}s ({ratio})"
+            f"  RSS {row['baseline_peak_rss_mb']:.0f} -> {row['peak_rss_mb']:.0f} MB"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the NCAA notebook questions outside marimo')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--output', default='bench_report.json', help='where to write the JSON report')
+    parser.add_argument('--compare', help='an earlier report to compare against')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='run only this scenario (repeatable)')
+    parser.add_argument('--workers', type=int, help='loader workers (default: all CPUs, or serial on one CPU)')
+    parser.add_argument('--no-allocations', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--decoder', default=DEFAULT_DECODER, choices=JSON_DECODERS, help='JSON decoder for the scenarios')
+    parser.add_argument('--decoders', action='store_true', help='also compare the parse throughput of every installed JSON decoder')
+    # Internal: measure a single scenario in this process
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--trace', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        steps = measure_steps(args.data_dir, args.cache_dir, args.workers, args.trace, args.decoder)
+        print(json.dumps({'steps': steps, 'peak_rss_mb': peak_rss_mb()}))
+        return
+
+    report = run_benchmark(
+        args.data_dir, args.scenario or SCENARIOS, args.workers, not args.no_allocations, args.decoder, args.decoders,
+    )
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    print(f"Report saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        print(format_comparison(compare_reports(baseline, report)))
+
+
+if __name__ == '__main__':
+    main()
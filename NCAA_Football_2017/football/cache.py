@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import polars as pl
+
+from football.fingerprint import code_fingerprint
+from football.loader import DATA_DIR, DEFAULT_DECODER, LazyGame, first_video, list_game_files, list_weeks, load_game_data
+from football.store import STORE_VERSION, TABLE_SCHEMAS, build_season_tables
+
+CACHE_DIR = '.season_cache'
+
+# Each week folder of the cache holds the week's tables as Parquet and a
+# manifest of the game files they were built from, so a warm run answers every
+# question without parsing any game file. The manifest also records a
+# fingerprint of the code that builds a week (build_week), so editing the table
+# builder, a play-text pattern or a schema rebuilds the cache by itself.
+
+
+def file_fingerprint(path, validate='mtime'):
+    # Identify a version of a game file by size and mtime, or by its content hash
+    stat = os.stat(path)
+    if validate == 'mtime':
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    elif validate == 'hash':
+        with open(path, 'rb') as f:
+            return {'size': stat.st_size, 'blake2b': hashlib.blake2b(f.read()).hexdigest()}
+    raise ValueError(f"Unknown validate mode: {validate!r} (use 'mtime' or 'hash')")
+
+
+def _week_fingerprints(data_dir, week, validate):
+    return {
+        file: file_fingerprint(path, validate)
+        for file, path in list_game_files(data_dir, [week])
+    }
+
+
+def _read_manifest(week_dir):
+    try:
+        with open(os.path.join(week_dir, 'manifest.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_week(week_dir, tables, manifest):
+    # Write the tables first and the manifest last, so an
+    # interrupted write leaves a week that simply gets rebuilt on the next run
+    os.makedirs(week_dir, exist_ok=True)
+    for name, table in tables.items():
+        tmp_path = os.path.join(week_dir, f'{name}.parquet.tmp')
+        table.write_parquet(tmp_path, statistics=True)
+        os.replace(tmp_path, os.path.join(week_dir, f'{name}.parquet'))
+
+    tmp_path = os.path.join(week_dir, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, os.path.join(week_dir, 'manifest.json'))
+
+
+def _read_week(week_dir):
+    return {
+        name: pl.read_parquet(os.path.join(week_dir, f'{name}.parquet'))
+        for name in TABLE_SCHEMAS
+    }
+
+
+def build_week(game_dict, week):
+    # A week's tables, and what the questions over game_dict need from each
+    # file, so a warm run can answer them without parsing it again
+    tables = build_season_tables(game_dict, {file: week for file in game_dict})
+    games = {
+        file: {'keys': list(game_data), 'video': first_video(game_data)}
+        for file, game_data in game_dict.items()
+    }
+    return tables, games
+
+
+@lru_cache(maxsize=None)
+def build_fingerprint():
+    # Fingerprint of build_week and every football function, class and constant it reaches
+    return code_fingerprint(build_week)
+
+
+def _update_week(data_dir, week, week_dir, validate='mtime', workers=0, decoder=DEFAULT_DECODER):
+    # The week's manifest, re-parsing the week's game files and rewriting its
+    # cache first when one was added, removed or changed
+    # Returns the manifest and the freshly built tables, or None for the tables
+    # if the cache was current
+    manifest = {
+        'store_version': STORE_VERSION,
+        'code': build_fingerprint(),
+        'validate': validate,
+        'files': _week_fingerprints(data_dir, week, validate),
+    }
+    saved = _read_manifest(week_dir)
+    # Caches written before games were summarized have no 'games' and are rebuilt
+    if saved is not None and saved.get('games') is not None and {key: saved.get(key) for key in manifest} == manifest:
+        return saved, None
+    game_dict = load_game_data(data_dir, workers=workers, weeks=[week], decoder=decoder)
+    tables, manifest['games'] = build_week(game_dict, week)
+    _write_week(week_dir, tables, manifest)
+    return manifest, tables
+
+
+def update_week(data_dir, week, week_dir, validate='mtime', workers=0, decoder=DEFAULT_DECODER):
+    # Bring one week's cache in week_dir up to date without reading its tables
+    # Returns the week's manifest and whether the week had to be re-parsed
+    manifest, tables = _update_week(data_dir, week, week_dir, validate, workers, decoder)
+    return manifest, tables is not None
+
+
+def load_week_tables(data_dir, week, week_dir, validate='mtime', workers=0, decoder=DEFAULT_DECODER):
+    # One week's tables from its Parquet cache in week_dir, re-parsing the week's
+    # game files only when one was added, removed or changed
+    # Returns the tables and whether the week had to be re-parsed
+    manifest, tables = _update_week(data_dir, week, week_dir, validate, workers, decoder)
+    if tables is None:
+        return _read_week(week_dir), False
+    return tables, True
+
+
+def load_week_games(data_dir, week, week_dir, validate='mtime', workers=0, decoder=DEFAULT_DECODER):
+    # One week's games as LazyGames that hold no keys in memory, from the
+    # manifest of its cache; the files are only parsed when the cache is stale
+    # Returns {file: LazyGame} and whether the week had to be re-parsed
+    manifest, tables = _update_week(data_dir, week, week_dir, validate, workers, decoder)
+    week_path = os.path.join(data_dir, week, 'full')
+    games = {
+        file: LazyGame(os.path.join(week_path, file), summary['keys'], {}, decoder, {'video': summary['video']})
+        for file, summary in manifest['games'].items()
+    }
+    return games, tables is not None
+
+
+def load_season_games(data_dir=DATA_DIR, cache_dir=CACHE_DIR, validate='mtime', workers=0, rebuilt=None,
+                      decoder=DEFAULT_DECODER, weeks=None):
+    # game_dict for the whole season from the per-week cache, in list_game_files
+    # order. Game counts, top-level keys and first videos come from the week
+    # manifests, so a warm run parses no game files; any other key of a game is
+    # read from its file the first time it is looked up.
+    # Pass a list as rebuilt to find out which weeks had to be re-parsed.
+    game_dict = {}
+    for week in (list_weeks(data_dir) if weeks is None else weeks):
+        games, week_rebuilt = load_week_games(
+            data_dir, week, os.path.join(cache_dir, week), validate, workers, decoder,
+        )
+        if week_rebuilt and rebuilt is not None:
+            rebuilt.append(week)
+        game_dict.update(games)
+    return game_dict
+
+
+def load_season_tables(data_dir=DATA_DIR, cache_dir=CACHE_DIR, validate='mtime', workers=0, rebuilt=None,
+                       decoder=DEFAULT_DECODER, weeks=None):
+    # Load the season tables from a per-week Parquet cache
+    # A week is re-parsed only when a game file in it was added, removed or changed
+    # (by size/mtime, or by content hash with validate='hash').
+    # Pass a list as rebuilt to find out which weeks had to be re-parsed.
+    # weeks defaults to every week folder found in data_dir
+    week_tables = []
+    for week in (list_weeks(data_dir) if weeks is None else weeks):
+        tables, week_rebuilt = load_week_tables(
+            data_dir, week, os.path.join(cache_dir, week), validate, workers, decoder,
+        )
+        if week_rebuilt and rebuilt is not None:
+            rebuilt.append(week)
+        week_tables.append(tables)
+
+    return {
+        name: pl.concat([tables[name] for tables in week_tables])
+        for name in TABLE_SCHEMAS
+    }
@@ -0,0 +1,126 @@
+import hashlib
+import inspect
+import re
+import types
+
+# Fingerprints of football code, so results computed from it (memoized answers,
+# cached week tables) can tell when the code that produced them was edited.
+# A function's fingerprint covers its own code and that of every football
+# function or class it reaches, plus the module-level constants they read.
+
+
+def _is_football(value):
+    return getattr(value, '__module__', '').split('.')[0] == 'football'
+
+
+def _code_names(code):
+    # Global and attribute names used by a code object and the code nested in it
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+# Module-level values (patterns, sentinels, lookup tables) that count as code
+CONSTANT_TYPES = (str, int, float, bool, tuple, list, dict, set, frozenset, re.Pattern)
+
+
+def _constant_text(value):
+    # A stable text form of a constant: compiled patterns by their full pattern
+    # and flags (their repr is truncated), functions and classes by name (their
+    # repr has an address), sets sorted (their order varies between runs with
+    # string hashing)
+    if isinstance(value, re.Pattern):
+        return repr((value.pattern, value.flags))
+    if isinstance(value, (types.FunctionType, type)):
+        return f'{value.__module__}.{value.__qualname__}'
+    if isinstance(value, dict):
+        return '{' + ', '.join(f'{_constant_text(k)}: {_constant_text(v)}' for k, v in value.items()) + '}'
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__ + '(' + ', '.join(_constant_text(item) for item in value) + ')'
+    if isinstance(value, (set, frozenset)):
+        return type(value).__name__ + '(' + ', '.join(sorted(_constant_text(item) for item in value)) + ')'
+    return repr(value)
+
+
+def _constant_functions(value):
+    # The football functions and classes held in a constant
+    if isinstance(value, dict):
+        return [found for item in value.items() for found in _constant_functions(item)]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [found for item in value for found in _constant_functions(item)]
+    if isinstance(value, (types.FunctionType, type)) and _is_football(value):
+        return [value]
+    return []
+
+
+def _references(value):
+    # The football functions and classes a function or class refers to, and
+    # the football module-level constants it reads, as {name: text}
+    if isinstance(value, type):
+        functions = [member for member in vars(value).values() if isinstance(member, types.FunctionType)]
+    else:
+        functions = [value]
+    found = []
+    constants = {}
+    for function in functions:
+        module_name = function.__globals__.get('__name__', '')
+        names = _code_names(function.__code__)
+        for name in names:
+            target = function.__globals__.get(name)
+            if isinstance(target, types.ModuleType) and target.__name__.split('.')[0] == 'football':
+                # module.function: follow the attributes the code looks up on it
+                found.extend(
+                    getattr(target, attribute) for attribute in names
+                    if _is_football(getattr(target, attribute, None))
+                )
+            elif isinstance(target, (types.FunctionType, type)) and _is_football(target):
+                found.append(target)
+            elif isinstance(target, CONSTANT_TYPES) and module_name.split('.')[0] == 'football':
+                constants[f'{module_name}.{name}'] = _constant_text(target)
+                # e.g. a table of functions: follow the ones it holds
+                found.extend(_constant_functions(target))
+    return found, constants
+
+
+def _code_text(code):
+    # A code object's own bytecode, names and constants, nested code included
+    parts = [code.co_code.hex(), ' '.join(code.co_names)]
+    for const in code.co_consts:
+        parts.append(_code_text(const) if isinstance(const, types.CodeType) else _constant_text(const))
+    return '\n'.join(parts)
+
+
+def _source(value):
+    # A lambda is fingerprinted by its code object: inspect.getsource returns
+    # the whole statement it sits in (e.g. every step of a list of steps)
+    code = getattr(value, '__code__', None)
+    if code is not None and code.co_name == '<lambda>':
+        return _code_text(code)
+    try:
+        return inspect.getsource(value)
+    except (OSError, TypeError):
+        return _code_text(code) if code is not None else repr(value)
+
+
+def code_fingerprint(function):
+    # Hash of the code of function and of every football function or class it
+    # reaches, so editing a query or a helper it calls changes the fingerprint
+    reached = {}
+    pending = [function]
+    while pending:
+        value = pending.pop()
+        key = (getattr(value, '__module__', ''), getattr(value, '__qualname__', repr(value)))
+        if key in reached:
+            continue
+        references, constants = _references(value)
+        reached[key] = _source(value)
+        reached.update({(name, ''): text for name, text in constants.items()})
+        pending.extend(references)
+
+    digest = hashlib.sha256()
+    for key in sorted(reached):
+        digest.update('.'.join(key).encode('utf-8'))
+        digest.update(reached[key].encode('utf-8'))
+    return digest.hexdigest()
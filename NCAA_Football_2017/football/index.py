@@ -0,0 +1,136 @@
+import polars as pl
+
+# Week folders in the order the games were played
+CHRONOLOGICAL_WEEKS = [
+    "Week 1", "Week 2", "Week 3", "Week 4", "Week 5",
+    "Week 6", "Week 7", "Week 8", "Week 9", "Week 10", "Week 11",
+    "Week 12", "Week 13", "Week 14", "Week 15", "Bowl"
+]
+
+
+class GameIndex:
+    # Chronological index of the season: week -> game ids -> parsed game
+    # Built from the games table, so it needs no extra disk access
+    def __init__(self, games_table, game_dict=None):
+        self.game_dict = game_dict if game_dict is not None else {}
+        self.weeks = {week: [] for week in CHRONOLOGICAL_WEEKS}
+        self.files = {}
+        self.kickoffs = {}
+
+        for row in games_table.select('game_id', 'file', 'week_name', 'date').iter_rows(named=True):
+            self.weeks.setdefault(row['week_name'], []).append(row['game_id'])
+            self.files[row['game_id']] = row['file']
+            self.kickoffs[row['game_id']] = row['date']
+
+        # Within a week, games are ordered by kickoff (competitions[0].date, an
+        # ISO timestamp that sorts as text); games without one come last, and
+        # games that kick off together keep their file order
+        for game_ids in self.weeks.values():
+            game_ids.sort(key=lambda game_id: (
+                self.kickoffs[game_id] is None, self.kickoffs[game_id] or '', self.files[game_id],
+            ))
+
+    def game_ids(self, week=None):
+        # Game ids in chronological order, optionally for a single week
+        if week is not None:
+            return list(self.weeks.get(week, []))
+        return [game_id for game_ids in self.weeks.values() for game_id in game_ids]
+
+    def game(self, game_id):
+        return self.game_dict[self.files[game_id]]
+
+    def iter_games(self):
+        # Yield (week, game_id, game) in the order the games were played
+        for week, game_ids in self.weeks.items():
+            for game_id in game_ids:
+                yield week, game_id, self.game(game_id)
+
+    def game_order(self):
+        # Table of game_id -> week and chronological position, for sorting query results
+        rows = []
+        for week, game_ids in self.weeks.items():
+            for game_id in game_ids:
+                rows.append((game_id, week, len(rows)))
+        return pl.DataFrame(
+            rows,
+            schema={'game_id': pl.Utf8, 'week_name': pl.Utf8, 'game_order': pl.Int32},
+            orient='row',
+        )
+
+
+class TeamIndex:
+    # Inverted index from a team (display name or team id) to its games
+    # Each game's drives and plays sit in one contiguous block of their tables,
+    # so per-team queries slice out just those games instead of scanning the season
+    def __init__(self, tables):
+        self.tables = None
+        self.team_ids = {}
+        self.games = {}
+        self.drive_slices = {}
+        self.play_slices = {}
+        self.files = {}
+        self.extend(tables)
+
+    def extend(self, tables):
+        # Index the tables of more games, appended after the ones already indexed,
+        # without re-indexing those
+        if self.tables is None:
+            drive_offset = play_offset = 0
+            self.tables = tables
+        else:
+            drive_offset = self.tables['drives'].height
+            play_offset = self.tables['plays'].height
+            self.tables = {
+                name: pl.concat([self.tables[name], table], rechunk=False)
+                for name, table in tables.items()
+            }
+
+        teams = tables['teams'].filter(pl.col('display_name').is_not_null())
+        self.team_ids.update(zip(teams['display_name'].to_list(), teams['team_id'].to_list()))
+        self.names_by_id = {team_id: name for name, team_id in self.team_ids.items()}
+
+        games_by_team = teams.group_by('display_name', maintain_order=True).agg(pl.col('game_id').unique(maintain_order=True))
+        for name, game_ids in zip(games_by_team['display_name'].to_list(), games_by_team['game_id'].to_list()):
+            self.games.setdefault(name, []).extend(game_ids)
+
+        self.drive_slices.update(self._game_slices(tables['drives'], drive_offset))
+        self.play_slices.update(self._game_slices(tables['plays'], play_offset))
+        self.files.update(zip(tables['games']['game_id'].to_list(), tables['games']['file'].to_list()))
+
+    @staticmethod
+    def _game_slices(table, offset=0):
+        # (offset, length) of each game's block of rows
+        slices = (
+            table.with_row_index('row', offset=offset)
+            .group_by('game_id', maintain_order=True)
+            .agg(pl.col('row').min().alias('offset'), pl.len().alias('length'))
+        )
+        return {
+            game_id: (offset, length)
+            for game_id, offset, length in slices.iter_rows()
+        }
+
+    def teams(self):
+        # Every team that appears in the data, sorted alphabetically
+        return sorted(self.team_ids)
+
+    def resolve(self, team):
+        # Accept either a display name or a team id
+        return self.names_by_id.get(team, team)
+
+    def games_for(self, teams):
+        # Game ids (in table order) for one team or a list of teams
+        if isinstance(teams, str):
+            teams = [teams]
+        game_ids = {game_id for team in teams for game_id in self.games.get(self.resolve(team), [])}
+        return [game_id for game_id in self.files if game_id in game_ids]
+
+    def game_plays(self, game_ids):
+        # All plays from the given games, with the team that had the ball on each drive
+        def gather(table, slices):
+            blocks = [table.slice(*slices[game_id]) for game_id in game_ids if game_id in slices]
+            return pl.concat(blocks) if blocks else table.clear()
+
+        drive_teams = gather(self.tables['drives'], self.drive_slices).select('game_id', 'drive_index', 'team')
+        plays = gather(self.tables['plays'], self.play_slices)
+        return plays.join(drive_teams, on=['game_id', 'drive_index'], how='left')
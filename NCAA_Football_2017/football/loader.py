@@ -0,0 +1,193 @@
+import json
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+
+DATA_DIR = '2017 Alabama football JSON'
+
+# JSON decoders that take the raw bytes of a file. The stdlib decoder is the
+# default; the others are optional installs that parse the same data faster.
+JSON_DECODERS = ['json', 'orjson', 'msgspec']
+DEFAULT_DECODER = 'json'
+
+
+@lru_cache(maxsize=None)
+def get_decoder(name=DEFAULT_DECODER):
+    # The bytes -> object function for a decoder name
+    # Decoders are looked up by name so process pool workers can resolve them too
+    if name == 'json':
+        return json.loads
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'msgspec':
+        import msgspec
+        return msgspec.json.Decoder().decode
+    raise ValueError(f"Unknown JSON decoder: {name!r} (use one of {JSON_DECODERS})")
+
+
+def available_decoders():
+    # The decoders that can be imported here
+    names = []
+    for name in JSON_DECODERS:
+        try:
+            get_decoder(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _week_number(week):
+    # 'Week 12' -> 12; other folders (e.g. 'Bowl') sort first
+    name, _, number = week.rpartition(' ')
+    return int(number) if name == 'Week' and number.isdigit() else 0
+
+
+def list_weeks(data_dir=DATA_DIR):
+    # The week folders of a season that have a 'full' folder of game files,
+    # bowls first, then by week number
+    weeks = [
+        week for week in os.listdir(data_dir)
+        if os.path.isdir(os.path.join(data_dir, week, 'full'))
+    ]
+    return sorted(weeks, key=lambda week: (_week_number(week), week))
+
+
+def list_game_files(data_dir=DATA_DIR, weeks=None):
+    # Collect (filename, path) pairs for every game in the 'full' folders
+    # Files are sorted within each week so the order never depends on os.listdir
+    # weeks defaults to every week folder found in data_dir
+    if weeks is None:
+        weeks = list_weeks(data_dir)
+    game_files = []
+    for week in weeks:
+        week_path = os.path.join(data_dir, week, 'full')
+        for file in sorted(os.listdir(week_path)):
+            game_files.append((file, os.path.join(week_path, file)))
+    return game_files
+
+
+class LazyGame(Mapping):
+    # A game that only keeps some of its top-level keys in memory
+    # The first lookup of any other key parses the file once and keeps the whole
+    # game, so touching several keys costs one parse, and membership checks and
+    # key listings never touch the disk
+    # summary holds facts already worked out from the file (e.g. by the week
+    # cache), such as its first video, so they can be answered without it
+    def __init__(self, path, keys, data, decoder=DEFAULT_DECODER, summary=None):
+        self.path = path
+        self._keys = keys
+        self._data = data
+        self._decoder = decoder
+        self.summary = summary
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._data, elapsed = read_game_file(self.path, decoder=self._decoder)
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def loaded_keys(self):
+        return list(self._data)
+
+
+def first_video(game_data):
+    # The game's first video highlight as {'url', 'headline', 'description'},
+    # or None when it has no videos or the first one has no web link
+    summary = getattr(game_data, 'summary', None)
+    if summary is not None and 'video' in summary:
+        return summary['video']
+    if 'videos' in game_data and len(game_data['videos']) > 0:
+        video = game_data['videos'][0]
+        if 'links' in video and 'web' in video['links']:
+            return {
+                'url': video['links']['web']['href'],
+                'headline': video.get('headline', 'No headline'),
+                'description': video.get('description', 'No description'),
+            }
+    return None
+
+
+def read_game_file(path, fields=None, decoder=DEFAULT_DECODER):
+    # Parse a single game file and time how long it took
+    # The raw bytes go straight to the decoder, without decoding them to a str first
+    # With fields, only those top-level keys are kept and the game is a LazyGame
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        game_data = get_decoder(decoder)(f.read())
+    if fields is not None:
+        game_data = LazyGame(path, list(game_data), {key: game_data[key] for key in fields if key in game_data}, decoder)
+    return game_data, time.perf_counter() - start
+
+
+def load_game_data(data_dir=DATA_DIR, workers=0, executor='process', timings=None, weeks=None, fields=None, decoder=DEFAULT_DECODER):
+    # Load every game file in the given weeks into a dictionary keyed by filename
+    # workers=0 loads serially, otherwise files are spread across a process
+    # or thread pool. Results always come back in list_game_files() order.
+    # Pass a dict as timings to get the seconds spent on each file.
+    # Pass fields (e.g. ['drives', 'scoringPlays', 'teams']) to keep only those
+    # top-level keys in memory; anything else is loaded on demand.
+    # decoder names the JSON decoder (see JSON_DECODERS).
+    game_files = list_game_files(data_dir, weeks)
+    # Fail early on an unknown decoder or one that is not installed
+    get_decoder(decoder)
+    paths = [path for file, path in game_files]
+
+    if workers:
+        if executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+        elif executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor: {executor!r} (use 'process' or 'thread')")
+        with pool:
+            # Hand out files in chunks so each worker round trip carries several games
+            chunksize = max(1, len(paths) // (workers * 4))
+            results = list(pool.map(partial(read_game_file, fields=fields, decoder=decoder), paths, chunksize=chunksize))
+    else:
+        results = [read_game_file(path, fields, decoder) for path in paths]
+
+    game_dict = {}
+    for (file, path), (game_data, elapsed) in zip(game_files, results):
+        game_dict[file] = game_data
+        if timings is not None:
+            timings[file] = elapsed
+
+    return game_dict
+
+
+def compare_decoders(data_dir=DATA_DIR, decoders=None, weeks=None, repeat=3):
+    # Parse throughput of each decoder over the season's files
+    # Every file is read into memory first, so only parsing is timed; the best
+    # of repeat passes is kept. Returns {decoder: {'seconds': ..., 'mb_per_s': ...}}.
+    contents = []
+    for file, path in list_game_files(data_dir, weeks):
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    total_mb = sum(len(data) for data in contents) / (1024 * 1024)
+
+    results = {}
+    for name in decoders or available_decoders():
+        loads = get_decoder(name)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for data in contents:
+                loads(data)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {'seconds': best, 'mb_per_s': total_mb / best}
+    return results
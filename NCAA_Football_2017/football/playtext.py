@@ -0,0 +1,84 @@
+import re
+import time
+
+import polars as pl
+
+# Structured fields pulled out of the free-text play descriptions, e.g.
+#   "Logan Tyler punt for 43 yds , Kyle Trego returns for 12 yds to the USC 1"
+# Each field is one pattern with a single capture group. The patterns stick to
+# syntax shared by Python's re and Polars' regex engine (no lookarounds), so the
+# per-play parser and the vectorized str.extract path return the same values.
+PLAY_TEXT_FIELDS = {
+    # First "N yd(s)" anywhere in the text, the fallback yardage for longest plays
+    'text_yards': (r'(\d+)\s*yd', pl.Int64),
+    # The distance right after the word punt ("punt for 43 yds"), used for punt
+    # statistics; anchored so blocked punts don't report their return yards, and
+    # so a failed match gives up at once instead of backtracking through the text
+    'punt_distance': (r'\bpunts? (?:for )?(\d+) y(?:ar)?ds?\b', pl.Int64),
+    'kick_distance': (r'(?:punt|kickoff) for (\d+) yds?', pl.Int64),
+    'field_goal_distance': (r'(\d+) yd (?:FG|field goal)', pl.Int64),
+    'return_yards': (r'returns? for (\d+) yds?', pl.Int64),
+    'penalty_yards': (r'\((-?\d+) yards?\)', pl.Int64),
+    'passer': (r'^(.+?) pass\b', pl.Utf8),
+    'receiver': (r'pass complete to (.+?) for\b', pl.Utf8),
+    'rusher': (r'^(.+?) run for\b', pl.Utf8),
+    'kicker': (r'^(.+?) (?:punt|kickoff|on-side kick|\d+ yd FG)', pl.Utf8),
+    'returner': (r', (.+?) returns? for\b', pl.Utf8),
+}
+
+PLAY_TEXT_RES = {
+    name: re.compile(pattern, re.IGNORECASE)
+    for name, (pattern, dtype) in PLAY_TEXT_FIELDS.items()
+}
+
+
+def parse_play_text(text, fields=PLAY_TEXT_FIELDS):
+    # Pull every structured field out of one play description
+    # Missing fields come back as None
+    parsed = {}
+    for name in fields:
+        match = PLAY_TEXT_RES[name].search(text) if text else None
+        if match is None:
+            parsed[name] = None
+        elif PLAY_TEXT_FIELDS[name][1] == pl.Utf8:
+            parsed[name] = match.group(1)
+        else:
+            parsed[name] = int(match.group(1))
+    return parsed
+
+
+def play_text_columns(text_column='text', fields=PLAY_TEXT_FIELDS):
+    # The same fields as Polars expressions, one str.extract per field
+    return [
+        pl.col(text_column).str.extract(f'(?i){PLAY_TEXT_FIELDS[name][0]}', 1)
+        .cast(PLAY_TEXT_FIELDS[name][1], strict=False)
+        .alias(name)
+        for name in fields
+    ]
+
+
+def compare_parsers(plays, text_column='text', fields=PLAY_TEXT_FIELDS):
+    # Time the per-play loop against the vectorized str.extract path on a plays table
+    # and count any rows where the two disagree
+    texts = plays[text_column].to_list()
+
+    start = time.perf_counter()
+    loop_rows = [parse_play_text(text, fields) for text in texts]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = plays.select(play_text_columns(text_column, fields))
+    vectorized_seconds = time.perf_counter() - start
+
+    loop_table = pl.DataFrame(loop_rows, schema={name: PLAY_TEXT_FIELDS[name][1] for name in fields})
+    mismatches = {
+        name: int((loop_table[name].ne_missing(vectorized[name])).sum())
+        for name in fields
+    }
+    return {
+        'plays': len(texts),
+        'loop_seconds': loop_seconds,
+        'vectorized_seconds': vectorized_seconds,
+        'speedup': loop_seconds / vectorized_seconds if vectorized_seconds else None,
+        'mismatches': mismatches,
+    }
@@ -0,0 +1,372 @@
+import re
+import statistics
+
+import polars as pl
+
+from football.loader import first_video
+
+# Vectorized versions of the notebook questions, run against the tables from
+# football.store.build_season_tables instead of looping over game_dict again.
+# The play-by-play totals are each split into a partial query, whose results
+# add up across games, weeks and seasons, and a merge that answers the question
+# from a list of partials. pl.concat of partials is itself a valid partial, so
+# the watcher and the season store can keep or gather them and merge at the end.
+
+
+# ESPN team id of the Alabama Crimson Tide; matching on it keeps Alabama State,
+# Alabama A&M and South Alabama out of Alabama's plays
+ALABAMA_TEAM_ID = '333'
+
+
+def _plays_with_drive_team(tables):
+    # Attach the team that had the ball on each play's drive
+    drive_teams = tables['drives'].select('game_id', 'drive_index', 'team')
+    return tables['plays'].join(drive_teams, on=['game_id', 'drive_index'], how='left')
+
+
+def _lower_type():
+    return pl.col('type_text').str.to_lowercase()
+
+
+def field_goal_partials(tables):
+    # Field goals made and missed by each team
+    return (
+        _plays_with_drive_team(tables)
+        .filter(pl.col('team').is_not_null() & (pl.col('team') != ''))
+        .filter(_lower_type().str.contains('field goal', literal=True))
+        .with_columns(_lower_type().str.contains('good', literal=True).alias('made'))
+        .with_columns(
+            (~pl.col('made') & (
+                _lower_type().str.contains('missed', literal=True)
+                | _lower_type().str.contains('no good', literal=True)
+            )).alias('missed')
+        )
+        .group_by('team', maintain_order=True)
+        .agg(pl.col('made').sum(), pl.col('missed').sum())
+    )
+
+
+def merge_field_goals(partials):
+    # Compare Alabama's field goal success rate to the average across all teams
+    team_fg = (
+        pl.concat(partials).group_by('team', maintain_order=True).sum()
+        .filter((pl.col('made') + pl.col('missed')) > 0)
+        .with_columns((pl.col('made') / (pl.col('made') + pl.col('missed'))).alias('success_rate'))
+    )
+
+    alabama = team_fg.filter(pl.col('team') == 'Alabama Crimson Tide')
+    alabama_made = alabama['made'].sum() if alabama.height else 0
+    alabama_missed = alabama['missed'].sum() if alabama.height else 0
+    alabama_total_attempts = alabama_made + alabama_missed
+    alabama_success_rate = alabama_made / alabama_total_attempts if alabama_total_attempts > 0 else 0
+
+    all_rates = team_fg['success_rate'].to_list()
+    avg_rate = sum(all_rates) / len(all_rates) if all_rates else 0
+    q6 = 'yes' if alabama_success_rate < avg_rate else 'no'
+    q6_1 = f"Alabama attempted {alabama_total_attempts} field goals, making {alabama_made} and missing {alabama_missed} for a {alabama_success_rate*100:.1f}% success rate. The average success rate across all teams was {avg_rate*100:.1f}%."
+    return q6, q6_1
+
+
+def analyze_field_goals(tables):
+    return merge_field_goals([field_goal_partials(tables)])
+
+
+def safety_partials(tables):
+    # One 'scored' row per safety (its game and scoring team) and one 'given_up'
+    # row for every other team in that game, in the order the safeties occur
+    safeties = (
+        tables['scoring_plays']
+        .with_row_index('scoring_order')
+        .filter(pl.col('scoring_type').str.to_lowercase().str.contains('safety', literal=True))
+    )
+    scored = safeties.select('game_id', 'team', pl.lit('scored').alias('side'))
+
+    game_teams = tables['teams'].with_row_index('team_order').select('game_id', 'team_order', 'display_name')
+    given_up = (
+        safeties.select('scoring_order', 'game_id', 'team')
+        .join(game_teams, on='game_id', how='inner')
+        .filter(
+            pl.col('display_name').is_not_null()
+            & (pl.col('display_name') != '')
+            & pl.col('display_name').ne_missing(pl.col('team'))
+        )
+        .sort('scoring_order', 'team_order')
+        .select('game_id', pl.col('display_name').alias('team'), pl.lit('given_up').alias('side'))
+    )
+    return pl.concat([scored, given_up])
+
+
+def merge_safety_games(partials):
+    # Count games where a safety occurred
+    safeties = pl.concat(partials)
+    return safeties.filter(pl.col('side') == 'scored')['game_id'].n_unique()
+
+
+def merge_safeties(partials):
+    # Safeties scored and given up by each team
+    # Teams keep the order in which they first scored/gave up a safety
+    safeties = pl.concat(partials).filter(pl.col('team').is_not_null() & (pl.col('team') != ''))
+    scored = safeties.filter(pl.col('side') == 'scored').group_by('team', maintain_order=True).len()
+    given_up = safeties.filter(pl.col('side') == 'given_up').group_by('team', maintain_order=True).len()
+    return {
+        'scored': dict(zip(scored['team'].to_list(), scored['len'].to_list())),
+        'given_up': dict(zip(given_up['team'].to_list(), given_up['len'].to_list())),
+    }
+
+
+def count_safety_games(tables):
+    return merge_safety_games([safety_partials(tables)])
+
+
+def track_safeties(tables):
+    return merge_safeties([safety_partials(tables)])
+
+
+def longest_play_partials(tables):
+    # The longest play(s) of these games, with their matchup
+    # statYardage is used when realistic (max play in football is ~109 yards),
+    # otherwise the yardage parsed from the play text
+    stat_yards = pl.col('stat_yardage').abs()
+    plays = (
+        tables['plays']
+        .with_row_index('play_order')
+        .with_columns(pl.when(stat_yards <= 110).then(stat_yards).otherwise(0).cast(pl.Int64).alias('yards'))
+        .with_columns(
+            pl.when(pl.col('yards') == 0)
+            .then(pl.col('text_yards').fill_null(0))
+            .otherwise(pl.col('yards'))
+            .alias('yards')
+        )
+        .filter((pl.col('yards') > 0) & (pl.col('yards') == pl.col('yards').max()))
+    )
+
+    matchups = tables['games'].select(
+        'game_id',
+        pl.col('file').str.extract(r'( - .+ vs .+\.json)', 1).fill_null(pl.col('file')).alias('matchup'),
+    )
+    return (
+        plays.join(matchups, on='game_id', how='left')
+        .sort('play_order')
+        .select('matchup', 'period', 'clock', 'text', 'yards')
+    )
+
+
+def merge_longest_plays(partials):
+    # Find the longest play(s) in the season
+    plays = pl.concat(partials)
+    longest = plays.filter(pl.col('yards') == pl.col('yards').max())
+    return [
+        {
+            'matchup': play['matchup'],
+            'quarter': play['period'] if play['period'] is not None else 'Unknown',
+            'clock': play['clock'] if play['clock'] is not None else 'Unknown',
+            'description': play['text'] if play['text'] is not None else 'No description',
+            'yards': play['yards'],
+        }
+        for play in longest.iter_rows(named=True)
+    ]
+
+
+def find_longest_plays(tables):
+    return merge_longest_plays([longest_play_partials(tables)])
+
+
+def count_alabama_punts(team_index, team_id=ALABAMA_TEAM_ID):
+    # Count punts on drives where Alabama had the ball
+    # Only Alabama's games are scanned, and drives only name the team with the
+    # ball, so the id is resolved to its display name
+    team = team_index.resolve(team_id)
+    punts = team_index.game_plays(team_index.games_for(team_id)).filter(
+        (pl.col('team') == team) & _lower_type().str.contains('punt', literal=True)
+    )
+    return punts.height
+
+
+def punt_distance_partials(tables):
+    # The distance of every punt, parsed from the play text when the tables were built
+    return (
+        tables['plays']
+        .filter(_lower_type().str.contains('punt', literal=True))
+        .select('punt_distance')
+        .drop_nulls()
+    )
+
+
+def merge_punt_statistics(partials):
+    # Longest, shortest and median punt distance
+    punt_distances = pl.concat(partials)['punt_distance'].to_list()
+    if punt_distances:
+        return {
+            'longest': max(punt_distances),
+            'shortest': min(punt_distances),
+            'median': statistics.median(punt_distances)
+        }
+    else:
+        return {'longest': 0, 'shortest': 0, 'median': 0}
+
+
+def calculate_punt_statistics(tables):
+    return merge_punt_statistics([punt_distance_partials(tables)])
+
+
+def drive_efficiency_partials(tables):
+    # Per-team drive counts and sums
+    # Drives without yards are not counted, but their results still are
+    result = pl.col('result').fill_null('')
+    return (
+        tables['drives']
+        .filter(pl.col('team').is_not_null() & (pl.col('team') != ''))
+        .group_by('team', maintain_order=True)
+        .agg([
+            pl.count('yards').alias('total_drives'),
+            pl.sum('yards').cast(pl.Int64).alias('total_yards'),
+            (result.str.to_lowercase().str.contains('touchdown', literal=True)
+             | result.str.contains('TD', literal=True)).sum().alias('touchdowns'),
+            result.str.to_lowercase().str.contains('interception|fumble|turnover|downs').sum().alias('turnovers'),
+        ])
+    )
+
+
+def merge_drive_efficiency(partials, top=10):
+    # Per-team drive efficiency, top teams by average yards per drive
+    totals = pl.concat(partials).group_by('team', maintain_order=True).sum()
+    team_stats = totals.select([
+        'team',
+        'total_drives',
+        (pl.col('total_yards') / pl.col('total_drives')).alias('avg_yards_per_drive'),
+        (pl.col('touchdowns') / pl.col('total_drives') * 100).alias('td_percentage'),
+        (pl.col('turnovers') / pl.col('total_drives') * 100).alias('turnover_percentage'),
+    ]).sort('avg_yards_per_drive', descending=True, maintain_order=True).head(top)
+
+    return team_stats.to_dicts()
+
+
+def analyze_offensive_performance(tables):
+    return merge_drive_efficiency([drive_efficiency_partials(tables)])
+
+
+# The play-by-play questions as {names: (partials, merge)}, keyed like the
+# answer steps in football.answers
+PARTIAL_QUESTIONS = {
+    ('q6', 'q6.1'): (field_goal_partials, merge_field_goals),
+    'q7': (safety_partials, merge_safety_games),
+    'safety_dict': (safety_partials, merge_safeties),
+    'q10': (longest_play_partials, merge_longest_plays),
+    'q13': (punt_distance_partials, merge_punt_statistics),
+    'q14': (drive_efficiency_partials, merge_drive_efficiency),
+}
+
+
+def question_partials(tables):
+    # Every play-by-play question's partial over these tables, keyed like PARTIAL_QUESTIONS
+    return {names: partials(tables) for names, (partials, merge) in PARTIAL_QUESTIONS.items()}
+
+
+def get_alabama_plays(game_index, team_index, team_id=ALABAMA_TEAM_ID):
+    # Find Alabama's first and last offensive plays of the season
+    # Plays come from Alabama games in chronological order, straight from memory
+    # Drives only name the team with the ball, so the id is resolved to its display name
+    team = team_index.resolve(team_id)
+    alabama_plays = (
+        team_index.game_plays(team_index.games_for(team_id))
+        .join(game_index.game_order(), on='game_id', how='inner')
+        .filter(
+            (pl.col('team') == team)
+            & ~pl.col('type_text').fill_null('None').is_in(['Kickoff', 'Timeout', 'End Period', 'End of Half'])
+        )
+        .sort('game_order', 'drive_index', 'play_index')
+    )
+
+    def describe(play):
+        return {
+            'week': play['week_name'],
+            'description': play['text'] if play['text'] is not None else '',
+            'yardage': play['stat_yardage'] if play['stat_yardage'] is not None else 0
+        }
+
+    return {
+        'first_play': describe(alabama_plays.row(0, named=True)) if alabama_plays.height else None,
+        'last_play': describe(alabama_plays.row(-1, named=True)) if alabama_plays.height else None
+    }
+
+
+def check_team_consistency(team_index):
+    # Check if teams are referenced consistently
+    # Compare team names in the filenames with the team names in the game data
+    teams_from_filenames = set()
+    for filename in team_index.files.values():
+        match = re.search(r' - (.+) vs (.+)\.json', filename)
+        if match:
+            teams_from_filenames.add(match.group(1))
+            teams_from_filenames.add(match.group(2))
+
+    inconsistencies = []
+    for team in teams_from_filenames:
+        if not any(
+            team.replace('_', '&') == gd_team or team.replace('_', ' and ') == gd_team or team == gd_team
+            for gd_team in team_index.team_ids
+        ):
+            inconsistencies.append(team)
+
+    return 'no' if inconsistencies else 'yes'
+
+
+def get_all_teams(team_index):
+    # Get all unique teams from the game data, sorted alphabetically
+    return team_index.teams()
+
+
+def most_safeties_scored(safety_dict):
+    # Team(s) that scored the most safeties, a single name unless there is a tie
+    if not safety_dict['scored']:
+        return []
+    max_safeties = max(safety_dict['scored'].values())
+    teams_with_most = [team for team, count in safety_dict['scored'].items() if count == max_safeties]
+    return teams_with_most if len(teams_with_most) > 1 else teams_with_most[0]
+
+
+def most_safeties_given_up(safety_dict, top=3):
+    # The teams that gave up the most safeties
+    sorted_teams = sorted(safety_dict['given_up'].items(), key=lambda x: x[1], reverse=True)
+    return [team for team, count in sorted_teams[:top]]
+
+
+# The remaining questions only need the game files themselves
+
+
+def count_games(game_dict):
+    # Count the number of games in the dataset
+    return len(game_dict)
+
+
+def get_top_level_keys(game_dict):
+    # Get the top-level keys from the first game file
+    first_game_file = list(game_dict.keys())[0]
+    return list(game_dict[first_game_file].keys())
+
+
+def assess_data_reliability(game_dict):
+    # Assess data reliability by checking for duplicates and consistency
+    # Check if all game IDs are unique (they should be from the filenames)
+    game_ids = [filename.split(' - ')[0] for filename in game_dict.keys()]
+    unique_ids = len(set(game_ids))
+    total_ids = len(game_ids)
+    games_with_complete_data = 0
+    for game_data in game_dict.values():
+        if 'gameInfo' in game_data and 'drives' in game_data and 'scoringPlays' in game_data:
+            games_with_complete_data += 1
+    has_duplicates = unique_ids != total_ids
+    completeness_rate = games_with_complete_data / total_ids
+
+    q4 = 'yes' if not has_duplicates and completeness_rate > 0.95 else 'no'
+    q4_1 = f"The dataset contains {total_ids} games with {unique_ids} unique game IDs. {games_with_complete_data} games ({completeness_rate*100:.1f}%) have complete data including gameInfo, drives, and scoringPlays sections."
+    return q4, q4_1
+
+
+def get_video_from_data(game_dict):
+    # Search through games for the first video highlight
+    for filename, game_data in game_dict.items():
+        video = first_video(game_data)
+        if video is not None:
+            return {**video, 'game': filename}
+    return None
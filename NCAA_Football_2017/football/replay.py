@@ -0,0 +1,252 @@
+import argparse
+import heapq
+import time
+from datetime import datetime
+
+from football.loader import DATA_DIR, DEFAULT_DECODER, JSON_DECODERS, load_game_data
+from football.store import clock_to_seconds
+
+# Replay the season's plays as a stream of events to drive in-game dashboards
+# from the local files instead of a live feed.
+# Every play in drives.previous[].plays[] becomes a PlayEvent, in the drive and
+# play order of the file, which is the order the plays happened. Each event is
+# stamped with a simulated time: the game's kickoff plus the game clock elapsed
+# so far, so games played at the same time interleave the way a live feed would
+# deliver them. The clock only sets the stamp; it never reorders a game's plays.
+# Subscribers see every event once and keep running statistics with constant
+# work per event; replay() runs as fast as it can, or paced at a multiple of
+# real time.
+#
+#   python -m football.replay
+#   python -m football.replay --decoder orjson
+
+PERIOD_SECONDS = 15 * 60
+
+# Top-level keys a replay needs from each game
+REPLAY_FIELDS = ['id', 'drives', 'teams', 'competitions']
+
+
+class PlayEvent:
+    __slots__ = (
+        'time', 'game_id', 'home', 'away', 'period', 'clock_seconds',
+        'home_score', 'away_score', 'team', 'play_type', 'play'
+    )
+
+    def __init__(self, time, game_id, home, away, period, clock_seconds,
+                 home_score, away_score, team, play_type, play):
+        self.time = time
+        self.game_id = game_id
+        self.home = home
+        self.away = away
+        self.period = period
+        self.clock_seconds = clock_seconds
+        self.home_score = home_score
+        self.away_score = away_score
+        self.team = team
+        self.play_type = play_type
+        self.play = play
+
+    def __repr__(self):
+        return (f"PlayEvent({self.away!r} {self.away_score} @ {self.home!r} {self.home_score}, "
+                f"period={self.period}, clock={self.clock_seconds}, type={self.play_type!r})")
+
+
+def kickoff_time(game_data):
+    # Kickoff as seconds since the epoch (e.g. '2017-09-03T00:00Z'), or 0 if unknown
+    competition = (game_data.get('competitions') or [{}])[0]
+    try:
+        return datetime.fromisoformat(competition['date']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def elapsed_seconds(period, clock_seconds):
+    # Game clock time since kickoff; overtime periods count as full periods
+    if not period:
+        return 0
+    remaining = clock_seconds if clock_seconds is not None else PERIOD_SECONDS
+    return (period - 1) * PERIOD_SECONDS + PERIOD_SECONDS - remaining
+
+
+def game_events(file, game_data):
+    # One game's plays as PlayEvents in drive and play order
+    # A stamp is never earlier than the previous play's, so a clock that reads
+    # out of order in the data can't make time run backwards within a game
+    game_id = game_data.get('id') or file.split(' - ')[0]
+    sides = {
+        team_info.get('homeAway'): team_info.get('team', {}).get('displayName')
+        for team_info in game_data.get('teams', [])
+    }
+    kickoff = kickoff_time(game_data)
+
+    events = []
+    last_time = kickoff
+    drives = game_data['drives'].get('previous', []) if 'drives' in game_data else []
+    for drive in drives:
+        team_data = drive.get('team')
+        team = team_data.get('displayName') if isinstance(team_data, dict) else None
+        for play in drive.get('plays', []):
+            period = (play.get('period') or {}).get('number')
+            clock_seconds = clock_to_seconds((play.get('clock') or {}).get('displayValue'))
+            type_data = play.get('type')
+            last_time = max(last_time, kickoff + elapsed_seconds(period, clock_seconds))
+            events.append(PlayEvent(
+                last_time, game_id, sides.get('home'), sides.get('away'),
+                period, clock_seconds, play.get('homeScore'), play.get('awayScore'), team,
+                type_data.get('text', '') if isinstance(type_data, dict) else '', play,
+            ))
+    return events
+
+
+def season_events(game_dict):
+    # Every play of the season as one stream in simulated time order
+    # Each game's stamps never decrease, so the games are merged rather than sorted
+    return heapq.merge(
+        *(game_events(file, game_data) for file, game_data in game_dict.items()),
+        key=lambda event: event.time,
+    )
+
+
+class Subscriber:
+    # Base class for anything fed by replay
+    # Subclasses keep running state in event() and return it from result()
+    name = None
+
+    def event(self, event):
+        pass
+
+    def result(self):
+        return None
+
+
+class LiveScores(Subscriber):
+    # Latest score and game clock of every game, keyed by game id
+    name = 'scores'
+
+    def __init__(self):
+        self.games = {}
+
+    def event(self, event):
+        if event.home_score is None or event.away_score is None:
+            return
+        self.games[event.game_id] = {
+            'home': event.home,
+            'away': event.away,
+            'home_score': event.home_score,
+            'away_score': event.away_score,
+            'period': event.period,
+            'clock_seconds': event.clock_seconds,
+        }
+
+    def result(self):
+        return self.games
+
+
+class LeadChanges(Subscriber):
+    # Number of lead changes in every game so far
+    name = 'lead_changes'
+
+    def __init__(self):
+        self.leader = {}
+        self.changes = {}
+
+    def event(self, event):
+        if event.home_score is None or event.away_score is None:
+            return
+        leader = (event.home_score > event.away_score) - (event.home_score < event.away_score)
+        if leader == 0:
+            return
+        previous = self.leader.get(event.game_id, 0)
+        if previous and previous != leader:
+            self.changes[event.game_id] = self.changes.get(event.game_id, 0) + 1
+        self.leader[event.game_id] = leader
+
+    def result(self):
+        return self.changes
+
+
+class TeamPlayStats(Subscriber):
+    # Running plays, yards and scoring plays for the team with the ball
+    name = 'team_plays'
+
+    def __init__(self):
+        self.teams = {}
+
+    def event(self, event):
+        if not event.team:
+            return
+        stats = self.teams.get(event.team)
+        if stats is None:
+            stats = self.teams[event.team] = {'plays': 0, 'yards': 0, 'scoring_plays': 0}
+        stats['plays'] += 1
+        yards = event.play.get('statYardage')
+        if isinstance(yards, int) and abs(yards) <= 110:
+            stats['yards'] += yards
+        if event.play.get('scoringPlay'):
+            stats['scoring_plays'] += 1
+
+    def result(self):
+        return self.teams
+
+
+def default_subscribers():
+    return [LiveScores(), LeadChanges(), TeamPlayStats()]
+
+
+def replay(events, subscribers, speed=None, stats=None):
+    # Feed every event to every subscriber and return their results by name
+    # speed=None replays as fast as possible; otherwise events are paced so
+    # speed simulated seconds pass per wall-clock second (speed=1 is real time)
+    # Pass a dict as stats to get the event count, wall seconds, events per
+    # second and how many times faster than simulated time the replay ran.
+    calls = [subscriber.event for subscriber in subscribers]
+    count = 0
+    first_time = last_time = None
+    start = time.perf_counter()
+    for event in events:
+        if first_time is None:
+            first_time = event.time
+        last_time = event.time
+        if speed is not None:
+            delay = start + (event.time - first_time) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        for call in calls:
+            call(event)
+        count += 1
+    seconds = time.perf_counter() - start
+
+    if stats is not None:
+        simulated = last_time - first_time if count else 0
+        stats.update({
+            'events': count,
+            'seconds': seconds,
+            'events_per_second': count / seconds if seconds else 0,
+            'simulated_seconds': simulated,
+            'times_real_time': simulated / seconds if seconds else 0,
+        })
+    return {subscriber.name: subscriber.result() for subscriber in subscribers}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the season's plays as an event stream")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--decoder', default=DEFAULT_DECODER, choices=JSON_DECODERS)
+    parser.add_argument('--speed', type=float, help='simulated seconds per second (default: as fast as possible)')
+    args = parser.parse_args(argv)
+
+    game_dict = load_game_data(args.data_dir, fields=REPLAY_FIELDS, decoder=args.decoder)
+    start = time.perf_counter()
+    events = list(season_events(game_dict))
+    ordering = time.perf_counter() - start
+
+    stats = {}
+    results = replay(events, default_subscribers(), args.speed, stats)
+    print(f"Ordered {stats['events']:,} plays from {len(game_dict)} games in {ordering:.2f}s")
+    print(f"Replayed them in {stats['seconds']:.2f}s ({stats['events_per_second']:,.0f} events/s, "
+          f"{stats['times_real_time']:,.0f}x simulated time)")
+    print(f"Lead changes: {sum(results['lead_changes'].values())} across {len(results['lead_changes'])} games")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+
+import polars as pl
+
+from football.answers import ANSWER_KEYS, ANSWER_STEPS, default_workers, run_step, step_label
+from football.cache import CACHE_DIR, file_fingerprint
+from football.fingerprint import code_fingerprint
+from football.loader import DATA_DIR, DEFAULT_DECODER, JSON_DECODERS, list_game_files
+
+# Regenerate the answer file without marimo, recomputing only what changed.
+# The answer steps form a dependency graph through their inputs. Every step gets
+# a fingerprint from its code (football.fingerprint: the step's own lambda and
+# every football function or class it reaches) and the fingerprints of its
+# inputs, down to the size and mtime of each game file. Answers are memoized on
+# disk under their fingerprint, so a run reuses every answer whose code and
+# inputs are unchanged and only loads the data the remaining questions need.
+#
+#   python -m football.runner
+#   python -m football.runner --output answers.json --force
+
+ANSWER_FILE = 'mis511_python_project_lmitchek.json'
+MEMO_FILE = '.answer_memo.json'
+
+# Bump to invalidate every memoized answer
+RUNNER_VERSION = 1
+
+# Run parameters that don't change any answer
+NEUTRAL_PARAMS = ['cache_dir', 'workers', 'decoder']
+
+
+def data_fingerprint(data_dir=DATA_DIR):
+    # Hash of the name, size and mtime of every game file
+    files = {file: file_fingerprint(path) for file, path in list_game_files(data_dir)}
+    return hashlib.sha256(json.dumps(files, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def step_fingerprints(params):
+    # Fingerprint of every step name, in step order
+    fingerprints = {
+        'data_dir': data_fingerprint(params['data_dir']),
+        'runtime': f"{RUNNER_VERSION} {platform.python_version()} polars {pl.__version__}",
+    }
+    fingerprints.update({name: '' for name in NEUTRAL_PARAMS})
+    for names, inputs, function in ANSWER_STEPS:
+        key = {
+            'step': step_label(names),
+            'code': code_fingerprint(function),
+            'inputs': {name: fingerprints[name] for name in inputs},
+            'runtime': fingerprints['runtime'],
+        }
+        fingerprint = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        for name in ([names] if isinstance(names, str) else names):
+            fingerprints[name] = fingerprint
+    return fingerprints
+
+
+def read_memo(memo_file=MEMO_FILE):
+    try:
+        with open(memo_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_memo(memo, memo_file=MEMO_FILE):
+    tmp_path = f'{memo_file}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(memo, f)
+    os.replace(tmp_path, memo_file)
+
+
+def run_answers(data_dir=DATA_DIR, cache_dir=CACHE_DIR, workers=None, decoder=DEFAULT_DECODER,
+                memo_file=MEMO_FILE, force=False, computed=None):
+    # Compute the answer file dictionary, reusing memoized answers whose
+    # fingerprint still matches. Steps run only when an answer needs them.
+    # Pass a list as computed to get the names of the steps that ran.
+    results = {
+        'data_dir': data_dir,
+        'cache_dir': cache_dir,
+        'workers': default_workers() if workers is None else workers,
+        'decoder': decoder,
+    }
+    fingerprints = step_fingerprints(results)
+    memo = {} if force else read_memo(memo_file)
+    steps = {}
+    for step in ANSWER_STEPS:
+        for name in ([step[0]] if isinstance(step[0], str) else step[0]):
+            steps[name] = step
+
+    def memoized(name):
+        entry = memo.get(name)
+        return entry is not None and entry['fingerprint'] == fingerprints[name]
+
+    def ensure(name):
+        # Make results[name] available, from the memo or by running its step
+        if name in results:
+            return
+        names, inputs, function = steps[name]
+        step_names = [names] if isinstance(names, str) else list(names)
+        if all(step_name in ANSWER_KEYS and memoized(step_name) for step_name in step_names):
+            for step_name in step_names:
+                results[step_name] = memo[step_name]['value']
+            return
+        for input_name in inputs:
+            ensure(input_name)
+        run_step(results, names, function)
+        if computed is not None:
+            computed.append(step_label(names))
+
+    for key in ANSWER_KEYS:
+        ensure(key)
+
+    answers = {key: results[key] for key in ANSWER_KEYS}
+    # Round-trip through JSON so memoized and fresh answers look the same
+    answers = json.loads(json.dumps(answers))
+    updated = {key: {'fingerprint': fingerprints[key], 'value': answers[key]} for key in ANSWER_KEYS}
+    if updated != memo:
+        write_memo(updated, memo_file)
+    return answers
+
+
+def write_answer_file(answers, output_filename=ANSWER_FILE):
+    # Same format as the notebook's answer cell
+    with open(output_filename, 'w') as outfile:
+        json.dump(answers, outfile, indent=3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Regenerate the NCAA answer file, recomputing only changed questions')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Parquet cache of the season tables')
+    parser.add_argument('--memo', default=MEMO_FILE, help='where memoized answers are kept')
+    parser.add_argument('--output', default=ANSWER_FILE, help='where to write the answer JSON')
+    parser.add_argument('--workers', type=int, help='loader workers (default: all CPUs, or serial on one CPU)')
+    parser.add_argument('--decoder', default=DEFAULT_DECODER, choices=JSON_DECODERS)
+    parser.add_argument('--force', action='store_true', help='ignore memoized answers and recompute everything')
+    args = parser.parse_args(argv)
+
+    computed = []
+    answers = run_answers(
+        args.data_dir, args.cache_dir, args.workers, args.decoder, args.memo, args.force, computed,
+    )
+    write_answer_file(answers, args.output)
+    print(f"Recomputed: {', '.join(computed) if computed else 'nothing (all answers memoized)'}")
+    print(f"Answer file saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
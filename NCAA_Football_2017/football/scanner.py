@@ -0,0 +1,80 @@
+import abc
+
+# Single pass over every game, drive and play in game_dict. Anything that needs
+# the parsed games registers an Accumulator and scan_season feeds all of them
+# from the same traversal, so each play is read only once. store.TableBuilder
+# is the accumulator that flattens the games into the tables every question
+# is answered from.
+
+HOOKS = ['game', 'drive', 'play', 'scoring_play']
+
+
+class Accumulator(abc.ABC):
+    # Base class for anything fed by scan_season
+    # Subclasses override only the hooks they need, return their answer from
+    # result() and must say how to add in another accumulator's state (merge)
+    name = None
+
+    def game(self, file, game_data):
+        pass
+
+    def drive(self, drive_index, drive, team):
+        pass
+
+    def play(self, play_index, play, play_type, team):
+        pass
+
+    def scoring_play(self, play, scoring_type):
+        pass
+
+    def result(self):
+        return None
+
+    @abc.abstractmethod
+    def merge(self, other):
+        # Add in the state of an accumulator of the same kind that was fed other
+        # games, as if they had been scanned after this one's
+        pass
+
+
+def _hook_calls(accumulators, hook):
+    # Bound methods for the accumulators that actually override a hook,
+    # so the per-play loop skips the no-op defaults
+    return [
+        getattr(acc, hook) for acc in accumulators
+        if getattr(type(acc), hook) is not getattr(Accumulator, hook)
+    ]
+
+
+def scan_season(game_dict, accumulators):
+    # Walk every game, drive and play once, feeding each accumulator as we go
+    # Returns each accumulator's result keyed by its name
+    game_calls, drive_calls, play_calls, scoring_calls = (_hook_calls(accumulators, hook) for hook in HOOKS)
+
+    for file, game_data in game_dict.items():
+        for call in game_calls:
+            call(file, game_data)
+
+        drives = game_data['drives'].get('previous', []) if 'drives' in game_data else []
+        for drive_index, drive in enumerate(drives):
+            team_data = drive.get('team')
+            team = team_data.get('displayName') if isinstance(team_data, dict) else None
+            for call in drive_calls:
+                call(drive_index, drive, team)
+
+            if not play_calls:
+                continue
+            for play_index, play in enumerate(drive.get('plays', [])):
+                type_data = play.get('type')
+                play_type = type_data.get('text', '') if isinstance(type_data, dict) else ''
+                for call in play_calls:
+                    call(play_index, play, play_type, team)
+
+        if scoring_calls:
+            for play in game_data.get('scoringPlays', []):
+                scoring_data = play.get('scoringType')
+                scoring_type = scoring_data.get('name', '') if isinstance(scoring_data, dict) else ''
+                for call in scoring_calls:
+                    call(play, scoring_type)
+
+    return {acc.name: acc.result() for acc in accumulators}
@@ -0,0 +1,143 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from football import queries
+from football.cache import update_week
+from football.loader import DEFAULT_DECODER, list_weeks
+from football.store import STORE_VERSION, TABLE_SCHEMAS
+
+# Season tables for many seasons, stored as one shard per (season, week).
+# Each shard is a week cache in the same format as football.cache, so it is only
+# re-parsed when its game files change, and a manifest at the top of the store
+# lists every shard. Queries that add up across games run on every shard in
+# parallel (one process per shard) and their partial results are merged at the
+# end, so no process ever holds more than a week of one season.
+#
+#   <store>/manifest.json
+#   <store>/<season>/<week>/{games,teams,drives,plays,scoring_plays}.parquet
+#
+# Seasons are folders laid out like '2017 Alabama football JSON' (week folders,
+# each with a 'full' folder of game files), all under one root folder.
+
+SEASON_STORE_DIR = '.season_store'
+
+
+def list_seasons(root_dir):
+    # {season: folder} for every folder under root_dir that has week folders
+    seasons = {}
+    for season in sorted(os.listdir(root_dir)):
+        season_dir = os.path.join(root_dir, season)
+        if os.path.isdir(season_dir) and list_weeks(season_dir):
+            seasons[season] = season_dir
+    return seasons
+
+
+def _pool_map(function, items, workers):
+    # map over a process pool, or serially with workers=0
+    if not workers:
+        return [function(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items, chunksize=1))
+
+
+def _update_shard(shard):
+    # Bring one shard's week cache up to date (runs in a worker process)
+    season, week, data_dir, store_dir, validate, decoder = shard
+    path = os.path.join(season, week)
+    manifest, rebuilt = update_week(data_dir, week, os.path.join(store_dir, path), validate, 0, decoder)
+    return {'season': season, 'week': week, 'path': path, 'games': len(manifest['games'])}, rebuilt
+
+
+def read_store_manifest(store_dir=SEASON_STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, 'manifest.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_store_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, 'manifest.json')
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def build_season_store(seasons, store_dir=SEASON_STORE_DIR, workers=0, validate='mtime', rebuilt=None,
+                       decoder=DEFAULT_DECODER):
+    # Bring the shard of every week of every season up to date, in parallel
+    # seasons is {season: folder}, e.g. from list_seasons
+    # Pass a list as rebuilt to get the (season, week) shards that were re-parsed.
+    shards = [
+        (season, week, data_dir, store_dir, validate, decoder)
+        for season, data_dir in seasons.items()
+        for week in list_weeks(data_dir)
+    ]
+    os.makedirs(store_dir, exist_ok=True)
+    results = _pool_map(_update_shard, shards, workers)
+
+    manifest = {
+        'store_version': STORE_VERSION,
+        'shards': [entry for entry, _ in results],
+    }
+    _write_store_manifest(store_dir, manifest)
+    if rebuilt is not None:
+        rebuilt.extend((entry['season'], entry['week']) for entry, shard_rebuilt in results if shard_rebuilt)
+    return manifest
+
+
+def _read_shard(shard_dir, tables):
+    return {name: pl.read_parquet(os.path.join(shard_dir, f'{name}.parquet')) for name in tables}
+
+
+def _apply_to_shard(task):
+    # Run one partial query on one shard (runs in a worker process)
+    function, shard_dir, tables = task
+    return function(_read_shard(shard_dir, tables))
+
+
+def _shard_dirs(store_dir, seasons=None):
+    # The folder of every shard in manifest order, optionally for some seasons only
+    manifest = read_store_manifest(store_dir)
+    if manifest is None or manifest.get('store_version') != STORE_VERSION:
+        raise ValueError(f"No up-to-date season store in {store_dir!r}; run build_season_store first")
+    return [
+        os.path.join(store_dir, shard['path'])
+        for shard in manifest['shards']
+        if seasons is None or shard['season'] in seasons
+    ]
+
+
+def map_shards(function, store_dir=SEASON_STORE_DIR, tables=None, workers=0, seasons=None):
+    # Run function(shard_tables) on every shard, in parallel, and return the
+    # results in manifest order. function must be importable by the worker
+    # processes (a module-level function). Only the named tables are read.
+    # Limit the run to some seasons with a list of season names.
+    tables = list(TABLE_SCHEMAS) if tables is None else tables
+    tasks = [(function, shard_dir, tables) for shard_dir in _shard_dirs(store_dir, seasons)]
+    return _pool_map(_apply_to_shard, tasks, workers)
+
+
+def season_drive_efficiency(store_dir=SEASON_STORE_DIR, workers=0, seasons=None, top=10):
+    # Question 14 (per-team drive efficiency) across every season in the store
+    partials = map_shards(queries.drive_efficiency_partials, store_dir, ['drives'], workers, seasons)
+    return queries.merge_drive_efficiency(partials, top)
+
+
+def season_answers(store_dir=SEASON_STORE_DIR, workers=0, seasons=None):
+    # The play-by-play answers (queries.PARTIAL_QUESTIONS: q6, q7, the safety
+    # counts, q10, q13 and q14) across every season in the store. Every shard's
+    # partials are computed in parallel and merged in manifest order.
+    shard_partials = map_shards(queries.question_partials, store_dir, workers=workers, seasons=seasons)
+    answers = {}
+    for names, (partials, merge) in queries.PARTIAL_QUESTIONS.items():
+        value = merge([shard[names] for shard in shard_partials])
+        if isinstance(names, str):
+            answers[names] = value
+        else:
+            answers.update(zip(names, value))
+    return answers
@@ -0,0 +1,236 @@
+import polars as pl
+
+from football.playtext import play_text_columns
+from football.scanner import Accumulator, scan_season
+
+# Bump to rebuild every cached table. Edits to the code that builds them (a
+# schema below, TableBuilder, a pattern in football.playtext) are caught by the
+# code fingerprint in each week's manifest (football.cache)
+STORE_VERSION = 5
+
+# Column types for each table built from the game files
+GAME_SCHEMA = {
+    'game_id': pl.Utf8,
+    'file': pl.Utf8,
+    'week_name': pl.Utf8,
+    'season': pl.Int16,
+    'week': pl.Int16,
+    'date': pl.Utf8,
+    'neutral_site': pl.Boolean,
+}
+
+TEAM_SCHEMA = {
+    'game_id': pl.Utf8,
+    'team_id': pl.Utf8,
+    'display_name': pl.Utf8,
+    'abbreviation': pl.Utf8,
+    'home_away': pl.Utf8,
+    'score': pl.Int16,
+    'winner': pl.Boolean,
+}
+
+DRIVE_SCHEMA = {
+    'game_id': pl.Utf8,
+    'drive_index': pl.Int32,
+    'drive_id': pl.Utf8,
+    'team': pl.Utf8,
+    'yards': pl.Int16,
+    'result': pl.Utf8,
+    'display_result': pl.Utf8,
+    'is_score': pl.Boolean,
+    'offensive_plays': pl.Int16,
+    'start_period': pl.Int8,
+    'start_yard_line': pl.Int16,
+    'end_yard_line': pl.Int16,
+}
+
+PLAY_SCHEMA = {
+    'game_id': pl.Utf8,
+    'drive_index': pl.Int32,
+    'play_index': pl.Int32,
+    'play_id': pl.Utf8,
+    'period': pl.Int8,
+    'clock': pl.Utf8,
+    'clock_seconds': pl.Int16,
+    'type_id': pl.Utf8,
+    'type_text': pl.Utf8,
+    'text': pl.Utf8,
+    'stat_yardage': pl.Int16,
+    'home_score': pl.Int16,
+    'away_score': pl.Int16,
+    'scoring_play': pl.Boolean,
+    'start_down': pl.Int8,
+    'start_distance': pl.Int16,
+    'start_yard_line': pl.Int16,
+    'end_yard_line': pl.Int16,
+}
+
+SCORING_PLAY_SCHEMA = {
+    'game_id': pl.Utf8,
+    'play_id': pl.Utf8,
+    'period': pl.Int8,
+    'clock': pl.Utf8,
+    'team': pl.Utf8,
+    'scoring_type': pl.Utf8,
+    'type_text': pl.Utf8,
+    'text': pl.Utf8,
+    'home_score': pl.Int16,
+    'away_score': pl.Int16,
+}
+
+TABLE_SCHEMAS = {
+    'games': GAME_SCHEMA,
+    'teams': TEAM_SCHEMA,
+    'drives': DRIVE_SCHEMA,
+    'plays': PLAY_SCHEMA,
+    'scoring_plays': SCORING_PLAY_SCHEMA,
+}
+
+
+def _get(data, *keys):
+    # Walk nested dictionaries, returning None as soon as a level is missing
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _to_int(value):
+    # Scores come through as strings like '24'
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clock_to_seconds(clock):
+    # Convert a game clock like '12:34' into seconds left in the period
+    minutes, _, seconds = (clock or '').partition(':')
+    if not (minutes.isdigit() and seconds.isdigit()):
+        return None
+    return int(minutes) * 60 + int(seconds)
+
+
+def _new_columns(schema):
+    return {column: [] for column in schema}
+
+
+def _append(columns, row):
+    for column, values in columns.items():
+        values.append(row[column])
+
+
+class TableBuilder(Accumulator):
+    # Flattens games into typed games/teams/drives/plays/scoring_plays tables
+    # in the single scan_season pass over the parsed games; the questions then
+    # run as queries over the tables instead of walking the games again
+    name = 'tables'
+
+    def __init__(self, game_weeks=None):
+        # game_weeks maps a filename to its week folder (e.g. 'Week 3' or 'Bowl')
+        self.game_weeks = game_weeks or {}
+        self.columns = {name: _new_columns(schema) for name, schema in TABLE_SCHEMAS.items()}
+
+    def game(self, file, game_data):
+        self.game_id = game_data.get('id') or file.split(' - ')[0]
+        competition = (game_data.get('competitions') or [{}])[0]
+
+        _append(self.columns['games'], {
+            'game_id': self.game_id,
+            'file': file,
+            'week_name': self.game_weeks.get(file),
+            'season': _get(game_data, 'season', 'year'),
+            'week': game_data.get('week'),
+            'date': competition.get('date'),
+            'neutral_site': competition.get('neutralSite'),
+        })
+
+        for team_info in game_data.get('teams', []):
+            _append(self.columns['teams'], {
+                'game_id': self.game_id,
+                'team_id': _get(team_info, 'team', 'id'),
+                'display_name': _get(team_info, 'team', 'displayName'),
+                'abbreviation': _get(team_info, 'team', 'abbreviation'),
+                'home_away': team_info.get('homeAway'),
+                'score': _to_int(team_info.get('score')),
+                'winner': team_info.get('winner'),
+            })
+
+    def drive(self, drive_index, drive, team):
+        self.drive_index = drive_index
+        result = drive.get('result')
+        _append(self.columns['drives'], {
+            'game_id': self.game_id,
+            'drive_index': drive_index,
+            'drive_id': drive.get('id'),
+            'team': team,
+            'yards': drive.get('yards', 0),
+            'result': _get(result, 'text') if isinstance(result, dict) else result,
+            'display_result': drive.get('displayResult'),
+            'is_score': drive.get('isScore'),
+            'offensive_plays': drive.get('offensivePlays'),
+            'start_period': _get(drive, 'start', 'period', 'number'),
+            'start_yard_line': _get(drive, 'start', 'yardLine'),
+            'end_yard_line': _get(drive, 'end', 'yardLine'),
+        })
+
+    def play(self, play_index, play, play_type, team):
+        clock = _get(play, 'clock', 'displayValue')
+        _append(self.columns['plays'], {
+            'game_id': self.game_id,
+            'drive_index': self.drive_index,
+            'play_index': play_index,
+            'play_id': play.get('id'),
+            'period': _get(play, 'period', 'number'),
+            'clock': clock,
+            'clock_seconds': clock_to_seconds(clock),
+            'type_id': _get(play, 'type', 'id'),
+            'type_text': _get(play, 'type', 'text'),
+            'text': play.get('text'),
+            'stat_yardage': play.get('statYardage'),
+            'home_score': play.get('homeScore'),
+            'away_score': play.get('awayScore'),
+            'scoring_play': play.get('scoringPlay'),
+            'start_down': _get(play, 'start', 'down'),
+            'start_distance': _get(play, 'start', 'distance'),
+            'start_yard_line': _get(play, 'start', 'yardLine'),
+            'end_yard_line': _get(play, 'end', 'yardLine'),
+        })
+
+    def scoring_play(self, play, scoring_type):
+        _append(self.columns['scoring_plays'], {
+            'game_id': self.game_id,
+            'play_id': play.get('id'),
+            'period': _get(play, 'period', 'number'),
+            'clock': _get(play, 'clock', 'displayValue'),
+            'team': _get(play, 'team', 'displayName'),
+            'scoring_type': _get(play, 'scoringType', 'name'),
+            'type_text': _get(play, 'type', 'text'),
+            'text': play.get('text'),
+            'home_score': play.get('homeScore'),
+            'away_score': play.get('awayScore'),
+        })
+
+    def merge(self, other):
+        # Append the rows other built, so its games follow this builder's
+        self.game_weeks.update(other.game_weeks)
+        for name, columns in self.columns.items():
+            for column, values in columns.items():
+                values.extend(other.columns[name][column])
+
+    def result(self):
+        tables = {
+            name: pl.DataFrame(self.columns[name], schema=schema)
+            for name, schema in TABLE_SCHEMAS.items()
+        }
+        # Parse the play text once here (kick distance, return yards, players,
+        # penalty yards, ...) so queries read columns instead of re-running regexes
+        tables['plays'] = tables['plays'].with_columns(play_text_columns())
+        return tables
+
+
+def build_season_tables(game_dict, game_weeks=None):
+    # Normalize every game into typed games/teams/drives/plays/scoring_plays tables
+    # Rows keep game_dict order, and plays keep their order within each drive
+    return scan_season(game_dict, [TableBuilder(game_weeks)])['tables']
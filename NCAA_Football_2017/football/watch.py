@@ -0,0 +1,180 @@
+import argparse
+import time
+
+import polars as pl
+
+from football import queries
+from football.answers import ANSWER_KEYS, ANSWER_STEPS, run_step
+from football.cache import file_fingerprint
+from football.index import GameIndex, TeamIndex
+from football.loader import DATA_DIR, DEFAULT_DECODER, JSON_DECODERS, LazyGame, first_video, list_game_files, list_weeks, read_game_file
+from football.runner import ANSWER_FILE, write_answer_file
+from football.store import TABLE_SCHEMAS, TableBuilder, build_season_tables
+
+# Keep the answers up to date while game files arrive during the season.
+# SeasonWatcher polls the week folders (new 'Week N/full' folders included) and
+# parses only the game files that were added or changed since the last poll.
+# Each new game is flattened once into its own tables. The play-by-play
+# partial queries (football.queries) run on just the new games, and their
+# per-team partials (field goals, safeties, punts, longest plays, drive stats)
+# are appended to the running ones; the tables are appended to the season tables
+# and the team index. The answers are then merged from the running partials.
+#
+# When a file changes or disappears, or a new game sorts before games already
+# seen (a bowl game, say), the season tables are re-assembled from the per-game
+# tables in file order and the partials recomputed from them, still without
+# re-parsing anything, so the answers are always the same as a full run's.
+#
+#   python -m football.watch
+#   python -m football.watch --interval 10 --output answers.json
+
+def _concat_tables(game_tables):
+    # Season tables from per-game tables (empty tables when there are no games)
+    if not game_tables:
+        return TableBuilder().result()
+    return {name: pl.concat([tables[name] for tables in game_tables]) for name in TABLE_SCHEMAS}
+
+
+class SeasonWatcher:
+    # Season state that is brought up to date from the game files that changed
+    def __init__(self, data_dir=DATA_DIR, decoder=DEFAULT_DECODER, validate='mtime'):
+        self.data_dir = data_dir
+        self.decoder = decoder
+        self.validate = validate
+        self.order = []             # game files in list_game_files order
+        self.fingerprints = {}      # file -> fingerprint when it was parsed
+        self.game_dict = {}
+        self.game_tables = {}
+        self.tables = _concat_tables([])
+        self.partials = queries.question_partials(self.tables)
+        self.team_index = TeamIndex(self.tables)
+        self.answers = None
+
+    def list_files(self):
+        # {file: (week, path)} for every game file on disk, in list_game_files order
+        files = {}
+        for week in list_weeks(self.data_dir):
+            for file, path in list_game_files(self.data_dir, [week]):
+                files[file] = (week, path)
+        return files
+
+    def changes(self, files=None):
+        # Game files added, changed and removed since they were last parsed
+        files = self.list_files() if files is None else files
+        added, changed = [], []
+        for file, (week, path) in files.items():
+            if file not in self.fingerprints:
+                added.append(file)
+            elif file_fingerprint(path, self.validate) != self.fingerprints[file]:
+                changed.append(file)
+        removed = [file for file in self.fingerprints if file not in files]
+        return added, changed, removed
+
+    def _ingest(self, file, week, path):
+        # Parse one game file; False if it could not be read (e.g. still being
+        # written), in which case it is tried again on the next poll
+        fingerprint = file_fingerprint(path, self.validate)
+        try:
+            game_data, elapsed = read_game_file(path, decoder=self.decoder)
+        except (OSError, ValueError):
+            return False
+        self.game_tables[file] = build_season_tables({file: game_data}, {file: week})
+        # Like the week cache, keep only what the questions over game_dict need
+        self.game_dict[file] = LazyGame(path, list(game_data), {}, self.decoder, {'video': first_video(game_data)})
+        self.fingerprints[file] = fingerprint
+        return True
+
+    def _drop(self, file):
+        for state in (self.fingerprints, self.game_dict, self.game_tables):
+            state.pop(file, None)
+
+    def refresh(self, files=None):
+        # Parse the game files that were added or changed and update the answers
+        # Returns the (added, changed, removed) files that were applied; a changed
+        # file that can no longer be read counts as removed until it can
+        files = self.list_files() if files is None else files
+        added, changed, removed = self.changes(files)
+        dropped = changed + removed
+        for file in dropped:
+            self._drop(file)
+        added = [file for file in added if self._ingest(file, *files[file])]
+        removed = removed + [file for file in changed if not self._ingest(file, *files[file])]
+        changed = [file for file in changed if file in self.fingerprints]
+
+        # self.order is still the order from before the drop
+        previous, order = self.order, [file for file in files if file in self.fingerprints]
+        if not dropped and order[:len(previous)] == previous:
+            # New games all come after the ones already merged: add them in
+            new_files = order[len(previous):]
+            if new_files:
+                new_tables = _concat_tables([self.game_tables[file] for file in new_files])
+                self.partials = {
+                    names: pl.concat([self.partials[names], partial])
+                    for names, partial in queries.question_partials(new_tables).items()
+                }
+                self.team_index.extend(new_tables)
+                self.tables = self.team_index.tables
+                self.game_dict = {file: self.game_dict[file] for file in order}
+        else:
+            # A game was dropped or sorts before the ones already merged:
+            # re-assemble the season from the per-game tables in file order
+            self.tables = _concat_tables([self.game_tables[file] for file in order])
+            self.partials = queries.question_partials(self.tables)
+            self.team_index = TeamIndex(self.tables)
+            self.game_dict = {file: self.game_dict[file] for file in order}
+        self.order = order
+        if self.answers is None or dropped or order != previous:
+            self.answers = self.compute_answers()
+        return added, changed, removed
+
+    def compute_answers(self):
+        # The answer file dictionary from the running partials and indexes
+        results = {
+            'game_dict': self.game_dict,
+            'season_tables': self.tables,
+            'game_index': GameIndex(self.tables['games'], self.game_dict),
+            'team_index': self.team_index,
+        }
+        for names, (partials, merge) in queries.PARTIAL_QUESTIONS.items():
+            run_step(results, names, lambda r: merge([self.partials[names]]))
+        for names, inputs, function in ANSWER_STEPS:
+            first = names if isinstance(names, str) else names[0]
+            if first not in results:
+                run_step(results, names, function)
+        return {key: results[key] for key in ANSWER_KEYS}
+
+    def watch(self, interval=5.0, on_refresh=None, polls=None):
+        # Poll every interval seconds (forever, or polls times) and call
+        # on_refresh(added, changed, removed, seconds) after every update
+        poll = 0
+        while polls is None or poll < polls:
+            start = time.perf_counter()
+            added, changed, removed = self.refresh()
+            if (added or changed or removed) and on_refresh is not None:
+                on_refresh(added, changed, removed, time.perf_counter() - start)
+            poll += 1
+            if polls is None or poll < polls:
+                time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Keep the NCAA answer file up to date as game files arrive')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--output', default=ANSWER_FILE, help='where to write the answer JSON')
+    parser.add_argument('--interval', type=float, default=5.0, help='seconds between polls')
+    parser.add_argument('--decoder', default=DEFAULT_DECODER, choices=JSON_DECODERS)
+    parser.add_argument('--validate', default='mtime', choices=['mtime', 'hash'])
+    args = parser.parse_args(argv)
+
+    watcher = SeasonWatcher(args.data_dir, args.decoder, args.validate)
+
+    def on_refresh(added, changed, removed, seconds):
+        write_answer_file(watcher.answers, args.output)
+        print(f"{len(added)} added, {len(changed)} changed, {len(removed)} removed "
+              f"in {seconds:.2f}s; answer file saved to: {args.output}")
+
+    watcher.watch(args.interval, on_refresh)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import football
+from football.loader import DATA_DIR
+
+# The full 2017 season the sample games are copied from
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(football.__file__))), DATA_DIR)
+
+# A small season copied from the 2017 data: Alabama's first two games, games of
+# Alabama State and South Alabama (which must never count as Alabama), and two
+# games with safeties
+SAMPLE_GAMES = {
+    'Week 1': ['400933827', '400933834', '400933835'],
+    'Week 2': ['400933841', '400944831', '400944835'],
+}
+
+# One more game for tests that add games: a bowl, which sorts before the weeks
+BOWL_GAME = ('Bowl', '400953322')
+
+
+def copy_game(data_dir, week, game_id):
+    # Copy one game file from the 2017 data into data_dir; returns its new path
+    source_dir = os.path.join(SOURCE_DIR, week, 'full')
+    file = next(file for file in sorted(os.listdir(source_dir)) if file.startswith(f'{game_id} - '))
+    target_dir = os.path.join(data_dir, week, 'full')
+    os.makedirs(target_dir, exist_ok=True)
+    path = os.path.join(target_dir, file)
+    shutil.copyfile(os.path.join(source_dir, file), path)
+    return path
+
+
+def edit_game(path, edit):
+    # Rewrite a game file with edit(game_data) applied, with a new mtime so the
+    # change is seen even on filesystems with coarse timestamps
+    with open(path, 'r') as f:
+        game_data = json.load(f)
+    edit(game_data)
+    stat = os.stat(path)
+    with open(path, 'w') as f:
+        json.dump(game_data, f)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    for week, game_ids in SAMPLE_GAMES.items():
+        for game_id in game_ids:
+            copy_game(data_dir, week, game_id)
+    return data_dir
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
@@ -0,0 +1,75 @@
+import json
+import os
+
+from conftest import edit_game
+
+from football import cache
+from football.answers import compute_answers
+from football.cache import load_season_games, load_season_tables
+from football.loader import list_game_files, load_game_data
+from football.store import build_season_tables
+
+
+def as_json(value):
+    return json.loads(json.dumps(value))
+
+
+def fresh_tables(data_dir):
+    game_dict = load_game_data(data_dir)
+    weeks = {file: os.path.basename(os.path.dirname(os.path.dirname(path))) for file, path in list_game_files(data_dir)}
+    return build_season_tables(game_dict, weeks)
+
+
+def lengthen_first_play(game_data):
+    game_data['drives']['previous'][0]['plays'][0]['statYardage'] = 105
+
+
+def test_warm_cache_parses_nothing(data_dir, cache_dir):
+    rebuilt = []
+    load_season_tables(data_dir, cache_dir, rebuilt=rebuilt)
+    assert rebuilt == ['Week 1', 'Week 2']
+
+    rebuilt = []
+    tables = load_season_tables(data_dir, cache_dir, rebuilt=rebuilt)
+    games = load_season_games(data_dir, cache_dir, rebuilt=rebuilt)
+    assert rebuilt == []
+    assert list(games) == [file for file, path in list_game_files(data_dir)]
+    for name, table in fresh_tables(data_dir).items():
+        assert tables[name].equals(table)
+
+
+def test_edited_game_rebuilds_only_its_week(data_dir, cache_dir):
+    before = compute_answers(data_dir, cache_dir, workers=0)
+    file, path = list_game_files(data_dir, ['Week 2'])[0]
+    edit_game(path, lengthen_first_play)
+
+    rebuilt = []
+    tables = load_season_tables(data_dir, cache_dir, rebuilt=rebuilt)
+    assert rebuilt == ['Week 2']
+    for name, table in fresh_tables(data_dir).items():
+        assert tables[name].equals(table)
+
+    after = as_json(compute_answers(data_dir, cache_dir, workers=0))
+    assert after != as_json(before)
+    assert after['q10'][0]['yards'] == 105
+    assert after == as_json(compute_answers(data_dir, cache_dir + '_fresh', workers=0))
+
+
+def test_removed_game_rebuilds_its_week(data_dir, cache_dir):
+    load_season_tables(data_dir, cache_dir)
+    file, path = list_game_files(data_dir, ['Week 1'])[0]
+    os.remove(path)
+
+    rebuilt = []
+    tables = load_season_tables(data_dir, cache_dir, rebuilt=rebuilt)
+    assert rebuilt == ['Week 1']
+    assert file not in tables['games']['file'].to_list()
+
+
+def test_edited_table_code_rebuilds_every_week(data_dir, cache_dir, monkeypatch):
+    load_season_tables(data_dir, cache_dir)
+    monkeypatch.setattr(cache, 'build_fingerprint', lambda: 'edited')
+
+    rebuilt = []
+    load_season_tables(data_dir, cache_dir, rebuilt=rebuilt)
+    assert rebuilt == ['Week 1', 'Week 2']
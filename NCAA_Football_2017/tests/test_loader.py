@@ -0,0 +1,35 @@
+from football import loader
+from football.loader import LazyGame, list_game_files, load_game_data, read_game_file
+
+
+def test_lazy_game_parses_the_file_once(data_dir, monkeypatch):
+    file, path = list_game_files(data_dir)[0]
+    game_data, elapsed = read_game_file(path)
+    reads = []
+
+    def counting_read(path, fields=None, decoder=loader.DEFAULT_DECODER):
+        reads.append(path)
+        return read_game_file(path, fields, decoder)
+
+    monkeypatch.setattr(loader, 'read_game_file', counting_read)
+    game = LazyGame(path, list(game_data), {})
+    assert 'drives' in game and len(game) == len(game_data)
+    assert reads == []
+    assert game['drives'] == game_data['drives']
+    assert game['teams'] == game_data['teams']
+    assert game['scoringPlays'] == game_data['scoringPlays']
+    assert reads == [path]
+
+
+def test_load_game_data_keeps_only_the_listed_fields(data_dir):
+    full = load_game_data(data_dir)
+    partial = load_game_data(data_dir, fields=['teams'])
+    assert list(partial) == list(full)
+    for file, game in partial.items():
+        assert list(game) == list(full[file])
+        assert game.loaded_keys() == ['teams']
+        assert game['teams'] == full[file]['teams']
+
+
+def test_load_game_data_in_parallel_matches_serial(data_dir):
+    assert load_game_data(data_dir, workers=2, executor='thread') == load_game_data(data_dir)
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from football import queries
+from football.index import TeamIndex
+from football.loader import load_game_data
+from football.scanner import Accumulator, scan_season
+from football.store import TableBuilder, build_season_tables
+
+
+def as_json(value):
+    return json.loads(json.dumps(value))
+
+
+@pytest.fixture
+def game_dict(data_dir):
+    return load_game_data(data_dir)
+
+
+def test_table_builders_merge_into_the_tables_of_one_pass(game_dict):
+    files = list(game_dict)
+    first, second = TableBuilder(), TableBuilder()
+    scan_season({file: game_dict[file] for file in files[:2]}, [first])
+    scan_season({file: game_dict[file] for file in files[2:]}, [second])
+    first.merge(second)
+    merged = first.result()
+    whole = build_season_tables(game_dict)
+    for name, table in whole.items():
+        assert merged[name].equals(table)
+
+
+def test_accumulators_must_define_merge():
+    class Plays(Accumulator):
+        def play(self, play_index, play, play_type, team):
+            pass
+
+    with pytest.raises(TypeError):
+        Plays()
+
+
+def test_partials_merge_to_the_whole_season_answers(game_dict):
+    # Each game's partials, merged, answer like one query over every game
+    tables = build_season_tables(game_dict)
+    per_game = [queries.question_partials(build_season_tables({file: game})) for file, game in game_dict.items()]
+    whole = queries.question_partials(tables)
+    for names, (partials, merge) in queries.PARTIAL_QUESTIONS.items():
+        assert as_json(merge([game[names] for game in per_game])) == as_json(merge([whole[names]]))
+    assert queries.count_safety_games(tables) == 2
+    assert queries.track_safeties(tables)['scored'] == {
+        'Mississippi State Bulldogs': 2, 'Appalachian State Mountaineers': 1,
+    }
+
+
+def test_alabama_punts_match_the_crimson_tide_only(game_dict):
+    tables = build_season_tables(game_dict)
+    team_index = TeamIndex(tables)
+    plays = queries._plays_with_drive_team(tables)
+    punts = plays.filter(plays['type_text'].str.to_lowercase().str.contains('punt'))
+    assert queries.count_alabama_punts(team_index) == (punts['team'] == 'Alabama Crimson Tide').sum()
+    assert punts['team'].str.contains('Alabama').sum() > queries.count_alabama_punts(team_index)
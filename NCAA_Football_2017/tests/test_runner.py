@@ -0,0 +1,64 @@
+import json
+import re
+
+from conftest import edit_game
+
+from football.answers import ANSWER_STEPS, compute_answers, step_label
+from football.fingerprint import code_fingerprint
+from football.loader import list_game_files
+from football.runner import run_answers
+
+
+def as_json(value):
+    return json.loads(json.dumps(value))
+
+
+def football_function(source, constants):
+    # A function compiled as if it lived in a football module
+    namespace = {'__name__': 'football.example', **constants}
+    exec(source, namespace)
+    function = namespace['example']
+    function.__module__ = 'football.example'
+    return function
+
+
+def test_memoized_answers_are_reused_until_the_data_changes(data_dir, cache_dir, tmp_path):
+    memo_file = str(tmp_path / 'memo.json')
+    computed = []
+    first = run_answers(data_dir, cache_dir, workers=0, memo_file=memo_file, computed=computed)
+    assert 'q10' in computed
+    assert first == as_json(compute_answers(data_dir, cache_dir, workers=0))
+
+    computed = []
+    assert run_answers(data_dir, cache_dir, workers=0, memo_file=memo_file, computed=computed) == first
+    assert computed == []
+
+    file, path = list_game_files(data_dir)[0]
+    edit_game(path, lambda game_data: game_data['drives']['previous'][0]['plays'][0].update(statYardage=105))
+    computed = []
+    edited = run_answers(data_dir, cache_dir, workers=0, memo_file=memo_file, computed=computed)
+    assert 'q10' in computed
+    assert edited['q10'][0]['yards'] == 105
+    assert edited == as_json(compute_answers(data_dir, str(tmp_path / 'fresh_cache'), workers=0))
+
+
+def test_each_step_has_its_own_code_fingerprint():
+    fingerprints = {step_label(names): code_fingerprint(function) for names, inputs, function in ANSWER_STEPS}
+    assert len(set(fingerprints.values())) == len(fingerprints)
+    assert fingerprints == {step_label(names): code_fingerprint(function) for names, inputs, function in ANSWER_STEPS}
+
+
+def test_lambda_fingerprint_follows_its_own_code():
+    steps = [lambda r: len(r['q3.1']), lambda r: len(r['q3.1']) + 1]
+    assert code_fingerprint(steps[0]) != code_fingerprint(steps[1])
+    assert code_fingerprint(steps[0]) == code_fingerprint(lambda r: len(r['q3.1']))
+
+
+def test_pattern_constants_count_by_their_whole_pattern():
+    source = 'def example(text):\n    return PATTERN.search(text)\n'
+    long_prefix = 'a' * 300
+    first = football_function(source, {'PATTERN': re.compile(long_prefix + 'b')})
+    second = football_function(source, {'PATTERN': re.compile(long_prefix + 'c')})
+    flagged = football_function(source, {'PATTERN': re.compile(long_prefix + 'b', re.IGNORECASE)})
+    assert repr(first.__globals__['PATTERN']) == repr(second.__globals__['PATTERN'])
+    assert len({code_fingerprint(first), code_fingerprint(second), code_fingerprint(flagged)}) == 3
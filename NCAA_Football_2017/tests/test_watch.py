@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+
+from conftest import BOWL_GAME, copy_game, edit_game
+
+from football.answers import compute_answers
+from football.watch import SeasonWatcher
+
+
+def as_json(value):
+    return json.loads(json.dumps(value))
+
+
+def fresh_answers(data_dir, tmp_path):
+    # The answers of a fresh run over data_dir, with a cache of its own
+    cache_dir = tmp_path / 'fresh_cache'
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return as_json(compute_answers(data_dir, str(cache_dir), workers=0))
+
+
+def test_watcher_matches_a_fresh_run_after_every_refresh(data_dir, tmp_path):
+    week_two = os.path.join(data_dir, 'Week 2')
+    parked = str(tmp_path / 'Week 2')
+    shutil.move(week_two, parked)
+    watcher = SeasonWatcher(data_dir)
+    added, changed, removed = watcher.refresh()
+    assert (len(added), changed, removed) == (3, [], [])
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+    # A new week sorts after the games already merged and is appended
+    shutil.move(parked, week_two)
+    added, changed, removed = watcher.refresh()
+    assert (len(added), changed, removed) == (3, [], [])
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+    # A bowl game sorts before the weeks, so the season is re-assembled
+    bowl_path = copy_game(data_dir, *BOWL_GAME)
+    added, changed, removed = watcher.refresh()
+    assert added == [os.path.basename(bowl_path)]
+    assert watcher.order[0] == os.path.basename(bowl_path)
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+    # An edited game replaces its old tables
+    edited_path = os.path.join(week_two, 'full', watcher.order[-1])
+    edit_game(edited_path, lambda game_data: game_data['drives']['previous'][0]['plays'][0].update(statYardage=105))
+    added, changed, removed = watcher.refresh()
+    assert (added, changed, removed) == ([], [watcher.order[-1]], [])
+    assert watcher.answers['q10'][0]['yards'] == 105
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+    # A game that can no longer be read counts as removed until it can
+    with open(edited_path, 'r') as f:
+        contents = f.read()
+    stat = os.stat(edited_path)
+    with open(edited_path, 'w') as f:
+        f.write(contents[:len(contents) // 2])
+    os.utime(edited_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    edited_file = os.path.basename(edited_path)
+    added, changed, removed = watcher.refresh()
+    assert (added, changed, removed) == ([], [], [edited_file])
+    assert edited_file not in watcher.order
+    shutil.move(edited_path, str(tmp_path / edited_file))
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+    # Once it is whole again it is added back
+    with open(str(tmp_path / edited_file), 'w') as f:
+        f.write(contents)
+    shutil.move(str(tmp_path / edited_file), edited_path)
+    added, changed, removed = watcher.refresh()
+    assert (added, changed, removed) == ([edited_file], [], [])
+    assert as_json(watcher.answers) == fresh_answers(data_dir, tmp_path)
+
+
+def test_refresh_without_changes_keeps_the_answers(data_dir):
+    watcher = SeasonWatcher(data_dir)
+    watcher.refresh()
+    answers = watcher.answers
+    assert watcher.refresh() == ([], [], [])
+    assert watcher.answers is answers